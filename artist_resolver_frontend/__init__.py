@@ -1,17 +1,46 @@
-from .toast import Toast, ToastType
-from .httpserver import HttpServer
-from .delegates import ArtistDelegate, ComboBoxDelegate
-from .customtreeview import CustomTreeView
-from .trackmodel import TrackModel
-from .mainwindow import MainWindow
+import importlib
 
-__all__ = [
-    "Toast",
-    "ToastType",
-    "HttpServer",
-    "ArtistDelegate",
-    "ComboBoxDelegate",
-    "CustomTreeView",
-    "TrackModel",
-    "MainWindow",
-]
+# submodules are imported on first access, so headless entry points
+# never load the gui modules and the PyQt widgets they depend on
+_exports = {
+    "Toast": ".toast",
+    "ToastType": ".toast",
+    "QtEventLoop": ".eventloop",
+    "Job": ".jobs",
+    "JobRegistry": ".jobs",
+    "Metrics": ".metrics",
+    "Histogram": ".metrics",
+    "Profiler": ".profiler",
+    "profiled": ".profiler",
+    "ProfilerOverlay": ".profileroverlay",
+    "LoadQueue": ".loadqueue",
+    "LoadRequestParser": ".requestparser",
+    "HttpServer": ".httpserver",
+    "RequestLimiter": ".requestlimiter",
+    "TagReader": ".tagreader",
+    "TagWriter": ".tagwriter",
+    "DirectoryScanner": ".scanner",
+    "ResolutionCache": ".resolutioncache",
+    "PersistentResolutionCache": ".resolutioncache",
+    "ArtistDelegate": ".delegates",
+    "ComboBoxDelegate": ".delegates",
+    "CustomTreeView": ".customtreeview",
+    "TrackModel": ".trackmodel",
+    "BatchRunner": ".batch",
+    "MainWindow": ".mainwindow",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_exports[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,138 @@
+import asyncio
+import time
+from artist_resolver.trackmanager import TrackManager
+from .metrics import Metrics
+from .requestlimiter import RequestLimiter
+from .resolutioncache import ResolutionCache
+from .scanner import DirectoryScanner
+from .tagreader import TagReader
+from .tagwriter import TagWriter
+from .trackmodel import TrackModel
+
+
+class BatchRunner:
+    """
+    Runs the load, resolve and save pipeline of the window without a gui.
+    Files found in the given paths are split into chunks, which are processed by
+    several workers at once. Every chunk gets its own track manager and model,
+    so memory stays bounded regardless of the size of the library.
+    """
+
+    def __init__(
+        self,
+        api_host: str,
+        api_port: str,
+        workers: int = 4,
+        chunk_size: int = 500,
+        replace_original_title: bool = True,
+        overwrite_original_title: bool = False,
+        replace_original_artist: bool = True,
+        overwrite_original_artist: bool = False,
+        tag_reader: TagReader | None = None,
+        tag_writer: TagWriter | None = None,
+        resolution_cache: ResolutionCache | None = None,
+        request_limiter: RequestLimiter | None = None,
+    ):
+        self.api_host = api_host
+        self.api_port = api_port
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.replace_original_title = replace_original_title
+        self.overwrite_original_title = overwrite_original_title
+        self.replace_original_artist = replace_original_artist
+        self.overwrite_original_artist = overwrite_original_artist
+        self.tag_reader = tag_reader or TagReader()
+        self.tag_writer = tag_writer or TagWriter()
+        self.resolution_cache = resolution_cache or ResolutionCache()
+        self.request_limiter = request_limiter or RequestLimiter()
+        self.metrics = Metrics()
+        self.failed_files = []
+
+    def create_track_model(self) -> TrackModel:
+        return TrackModel(
+            TrackManager(self.api_host, self.api_port),
+            self.tag_reader,
+            self.resolution_cache,
+            self.request_limiter,
+            self.tag_writer,
+            self.metrics,
+        )
+
+    async def get_chunks(self, paths: list[str]):
+        """Regroups the batches of a directory scan into chunks of chunk_size files"""
+        chunk = []
+        async for batch in DirectoryScanner(paths).scan():
+            chunk.extend(batch)
+            while len(chunk) >= self.chunk_size:
+                yield chunk[: self.chunk_size]
+                chunk = chunk[self.chunk_size :]
+        if chunk:
+            yield chunk
+
+    async def process_chunk(self, files: list[str]) -> None:
+        track_model = self.create_track_model()
+        try:
+            await track_model.load_files(
+                files,
+                self.replace_original_title,
+                self.overwrite_original_title,
+                self.replace_original_artist,
+                self.overwrite_original_artist,
+                True,
+            )
+        except Exception as e:
+            self.failed_files.extend((file, str(e)) for file in files)
+            return
+
+        try:
+            await track_model.save_files()
+        except Exception as e:
+            # files that could not be written stay dirty
+            self.failed_files.extend(
+                (track.file_path, track_model.save_errors.get(id(track), str(e)))
+                for track in track_model.dirty_tracks.values()
+            )
+
+    async def worker(self, queue: asyncio.Queue) -> None:
+        while (files := await queue.get()) is not None:
+            await self.process_chunk(files)
+
+    async def run(self, paths: list[str]) -> dict:
+        """Processes all mp3 files in the given paths and returns a summary"""
+        with self.metrics.time_request("health"):
+            healthy = await self.create_track_model().track_manager.get_server_health()
+        if not healthy:
+            raise Exception(
+                "The server is not healthy. Please check the server status."
+            )
+
+        start = time.perf_counter()
+        # the queue only holds a few chunks, so scanning does not run ahead of the workers
+        queue = asyncio.Queue(maxsize=self.workers * 2)
+        workers = [asyncio.create_task(self.worker(queue)) for _ in range(self.workers)]
+
+        try:
+            async for chunk in self.get_chunks(paths):
+                await queue.put(chunk)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "files_loaded": self.metrics.files_loaded,
+            "files_saved": self.metrics.files_saved,
+            "files_failed": len(self.failed_files),
+            "seconds": round(elapsed, 2),
+            "files_per_second": round(self.metrics.files_loaded / elapsed, 2)
+            if elapsed
+            else 0.0,
+            "cache": self.resolution_cache.stats(),
+        }
+
+    def shutdown(self) -> None:
+        self.tag_reader.shutdown()
+        self.tag_writer.shutdown()
@@ -1,5 +1,6 @@
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
     QTreeView,
 )
@@ -10,6 +11,8 @@ class CustomTreeView(QTreeView):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = parent
+        # shift and ctrl select several tracks, which are removed and converted at once
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.RightButton:
@@ -20,3 +23,14 @@ class CustomTreeView(QTreeView):
                 clipboard.setText(cell_value)
                 self.main_window.show_toast(f"Copied {cell_value}", ToastType.INFO, 500)
         super().mousePressEvent(event)
+
+    def paintEvent(self, event):
+        # delegate painting happens within the paint event of the view
+        profiler = self.main_window.profiler
+        if profiler is None:
+            super().paintEvent(event)
+        else:
+            with profiler.span("paint", "view"):
+                super().paintEvent(event)
+
+        self.main_window.view_painted()
@@ -2,6 +2,7 @@ from PyQt6.QtCore import Qt, QModelIndex
 from PyQt6.QtGui import (
     QPalette,
     QColor,
+    QFont,
     QPainter,
 )
 from PyQt6.QtWidgets import (
@@ -13,107 +14,153 @@ from artist_resolver.trackmanager import (
     MbArtistDetails,
     SimpleArtistDetails,
 )
+from .trackmodel import ArtistNode
 
 
 class ArtistDelegate(QStyledItemDelegate):
+    """
+    Colors artist rows by their state and renders track rows in bold.
+    Colors are precomputed and the style of every artist is cached until
+    the model reports a change, so painting a cell is a lookup.
+    """
+
+    # set to purple if artist was updated from server
+    server_data_color = QColor(164, 97, 240)
+    # set to red if the artist was not edited
+    simple_artist_color = QColor(255, 23, 62)
+    # set to blue if artist was not updated from server but has mbartist details
+    mbartist_color = QColor(0, 128, 255)
+    # set to green if the artist was edited
+    custom_name_edited_color = QColor(58, 235, 157)
+    # set to orange if the artist is likely to be an incorrect relation
+    invalid_relation_color = QColor(255, 128, 0)
+    # grey out entire line if the artist is not included
+    excluded_color = QColor(95, 95, 95)
+
+    # reduced intensity of each color for artists that are not included
+    excluded_colors = {
+        color.rgb(): QColor(
+            int(color.red() * 0.7),
+            int(color.green() * 0.7),
+            int(color.blue() * 0.7),
+        )
+        for color in (
+            server_data_color,
+            simple_artist_color,
+            mbartist_color,
+            custom_name_edited_color,
+            invalid_relation_color,
+        )
+    }
+
     def __init__(self, parent=None, model=None):
         super().__init__(parent)
+        self.model = None
+        # id(artist) -> (custom name column color, color of all other columns)
+        self.artist_styles = {}
+        # base font key -> scaled bold font of track rows
+        self.track_fonts = {}
+        self.set_model(model)
+
+    def set_model(self, model) -> None:
+        """Switches the model the delegate paints, styles are invalidated on every model change"""
+        if self.model is not None:
+            self.model.dataChanged.disconnect(self.invalidate_rows)
+            for signal in self.get_reset_signals(self.model):
+                signal.disconnect(self.invalidate)
+
         self.model = model
         self.custom_name_column = self.model.get_artist_column("custom_name")
-
-    def apply_simple_artist_condition(self, artist, option):
-        if not isinstance(artist, SimpleArtistDetails):
-            return False
-
-        if artist.has_server_data:
-            # set to purple if artist was updated from server
-            option.palette.setColor(QPalette.ColorRole.Text, QColor(164, 97, 240))
-            return True
-        else:
-            # set to red if the artist was not edited
-            option.palette.setColor(QPalette.ColorRole.Text, QColor(255, 23, 62))
-            return True
-        return False
-
-    def apply_mbartist_condition(self, artist, option):
-        if not isinstance(artist, MbArtistDetails) or isinstance(
-            artist, SimpleArtistDetails
-        ):
-            return False
-
-        if artist.has_server_data:
-            # set to purple if artist was updated from server
-            option.palette.setColor(QPalette.ColorRole.Text, QColor(164, 97, 240))
-            return True
-        else:
-            # set to blue if artist was not updated from server but has mbartist details
-            option.palette.setColor(QPalette.ColorRole.Text, QColor(0, 128, 255))
-            return True
-
-        return False
-
-    def apply_custom_name_edited_true_condition(self, artist, option):
-        if artist.custom_name_edited:
-            # set to green if the artist was edited
-            option.palette.setColor(QPalette.ColorRole.Text, QColor(58, 235, 157))
-            return True
-        return False
-
-    def apply_invalid_relation_true_condition(self, artist, option):
+        self.artist_styles.clear()
+
+        self.model.dataChanged.connect(self.invalidate_rows)
+        for signal in self.get_reset_signals(self.model):
+            signal.connect(self.invalidate)
+
+    @staticmethod
+    def get_reset_signals(model) -> list:
+        return [model.layoutChanged, model.modelReset, model.rowsRemoved]
+
+    def invalidate(self, *_) -> None:
+        self.artist_styles.clear()
+
+    def invalidate_rows(self, top_left: QModelIndex, bottom_right: QModelIndex, *_):
+        """Drops the cached styles of all artists in or below the changed rows"""
+        parent = top_left.parent()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            node = self.model.index(row, 0, parent).internalPointer()
+            if isinstance(node, ArtistNode):
+                self.artist_styles.pop(id(node.artist), None)
+                continue
+
+            track_node = self.model.get_track_node(node)
+            if track_node is not None:
+                for child in track_node.children:
+                    self.artist_styles.pop(id(child.artist), None)
+
+    def get_artist_color(self, artist) -> QColor | None:
+        """Returns the color of the custom name column of an artist, later conditions take precedence"""
         if artist.invalid_relation:
-            # set to orange if the artist is likely to be an incorrect relation
-            option.palette.setColor(QPalette.ColorRole.Text, QColor(255, 128, 0))
-            return True
-        return False
-
-    def apply_include_condition(self, artist, option, color_modified):
-        if not artist.include:
-            if color_modified:
-                # Get the current text color
-                current_color = option.palette.color(QPalette.ColorRole.Text)
-                # Reduce the color intensity
-                reduced_color = QColor(
-                    int(current_color.red() * 0.7),
-                    int(current_color.green() * 0.7),
-                    int(current_color.blue() * 0.7),
-                )
-                option.palette.setColor(QPalette.ColorRole.Text, reduced_color)
-            else:
-                # grey out entire line if the artist is not included
-                option.palette.setColor(QPalette.ColorRole.Text, QColor(95, 95, 95))
+            return self.invalid_relation_color
+        if artist.custom_name_edited:
+            return self.custom_name_edited_color
+        if isinstance(artist, SimpleArtistDetails):
+            return (
+                self.server_data_color
+                if artist.has_server_data
+                else self.simple_artist_color
+            )
+        if isinstance(artist, MbArtistDetails):
+            return (
+                self.server_data_color
+                if artist.has_server_data
+                else self.mbartist_color
+            )
+        return None
+
+    def create_artist_style(self, artist) -> tuple[QColor | None, QColor | None]:
+        color = self.get_artist_color(artist)
+        if artist.include:
+            return color, None
+
+        # the include condition is applied last and dims colored cells
+        if color is None:
+            return self.excluded_color, self.excluded_color
+        return self.excluded_colors[color.rgb()], self.excluded_color
+
+    def get_artist_style(self, artist) -> tuple[QColor | None, QColor | None]:
+        style = self.artist_styles.get(id(artist))
+        if style is None:
+            style = self.artist_styles[id(artist)] = self.create_artist_style(artist)
+        return style
+
+    def get_track_font(self, font: QFont) -> QFont:
+        key = font.key()
+        track_font = self.track_fonts.get(key)
+        if track_font is None:
+            # bold text for track rows
+            track_font = QFont(font)
+            track_font.setPixelSize(int(font.pixelSize() * 1.08))
+            track_font.setBold(True)
+            self.track_fonts[key] = track_font
+        return track_font
 
     def paint(
         self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex
     ):
-        column = index.column()
-        color_modified = False
+        node = index.internalPointer()
 
-        if not index.parent().isValid():
+        if not isinstance(node, ArtistNode):
             # This is a track item (parent)
-            track = index.internalPointer()
-            # bold text for track rows
-            font = option.font
-            font.setPixelSize(int(font.pixelSize() * 1.08))
-            font.setBold(True)
-            option.font = font
+            option.font = self.get_track_font(option.font)
         else:
             # This is an artist item
-            track = index.parent().internalPointer()
-            artist = track.artist_details[index.row()]
-
-            # Apply conditions
-            if column == self.custom_name_column:
-                color_modified |= self.apply_simple_artist_condition(artist, option)
-                color_modified |= self.apply_mbartist_condition(artist, option)
-                color_modified |= self.apply_custom_name_edited_true_condition(
-                    artist, option
-                )
-                color_modified |= self.apply_invalid_relation_true_condition(
-                    artist, option
-                )
-
-            # Apply the include condition last
-            self.apply_include_condition(artist, option, color_modified)
+            custom_name_color, color = self.get_artist_style(node.artist)
+            if index.column() == self.custom_name_column:
+                color = custom_name_color
+
+            if color is not None:
+                option.palette.setColor(QPalette.ColorRole.Text, color)
 
         super().paint(painter, option, index)
 
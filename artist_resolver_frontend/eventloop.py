@@ -0,0 +1,164 @@
+import asyncio
+import heapq
+import itertools
+import math
+import selectors
+from PyQt6.QtCore import Qt, QTimer, QSocketNotifier
+
+
+class QtSelector(selectors.DefaultSelector):
+    """
+    Selector that mirrors every registered file descriptor with QSocketNotifiers,
+    so the Qt event dispatcher can wake up the asyncio loop once a socket becomes ready.
+    """
+
+    def __init__(self, on_activity):
+        super().__init__()
+        self.on_activity = on_activity
+        self.notifiers = {}
+
+    def register(self, fileobj, events, data=None):
+        key = super().register(fileobj, events, data)
+        self.create_notifiers(key)
+        return key
+
+    def unregister(self, fileobj):
+        key = super().unregister(fileobj)
+        self.remove_notifiers(key.fd)
+        return key
+
+    def modify(self, fileobj, events, data=None):
+        key = super().modify(fileobj, events, data)
+        self.create_notifiers(key)
+        return key
+
+    def close(self):
+        for fd in list(self.notifiers):
+            self.remove_notifiers(fd)
+        super().close()
+
+    def create_notifiers(self, key: selectors.SelectorKey):
+        self.remove_notifiers(key.fd)
+
+        notifiers = []
+        if key.events & selectors.EVENT_READ:
+            notifiers.append(QSocketNotifier(key.fd, QSocketNotifier.Type.Read))
+        if key.events & selectors.EVENT_WRITE:
+            notifiers.append(QSocketNotifier(key.fd, QSocketNotifier.Type.Write))
+
+        for notifier in notifiers:
+            notifier.activated.connect(
+                lambda *_, notifier=notifier: self.notifier_activated(notifier)
+            )
+        self.notifiers[key.fd] = notifiers
+
+    def remove_notifiers(self, fd: int):
+        for notifier in self.notifiers.pop(fd, []):
+            notifier.setEnabled(False)
+
+    def notifier_activated(self, notifier: QSocketNotifier):
+        # notifiers are level triggered, keep them quiet until the loop
+        # had a chance to consume the event
+        notifier.setEnabled(False)
+        self.on_activity()
+
+    def enable_notifiers(self):
+        for notifiers in self.notifiers.values():
+            for notifier in notifiers:
+                notifier.setEnabled(True)
+
+
+class QtEventLoop(asyncio.SelectorEventLoop):
+    """
+    Asyncio event loop driven by the Qt event dispatcher.
+    A single loop iteration is run whenever a registered socket becomes ready,
+    a scheduled callback is due or a new callback is queued, so the loop does
+    not use any CPU time while the application is idle.
+    """
+
+    def __init__(self):
+        self.wakeup_pending = False
+        # set if a wakeup fired while an iteration was still running
+        self.wakeup_deferred = False
+        self.pending_timers = []
+        self.timer_sequence = itertools.count()
+
+        self.wakeup_timer = QTimer()
+        self.wakeup_timer.setSingleShot(True)
+        self.wakeup_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.wakeup_timer.timeout.connect(self.run_once)
+
+        self.selector = QtSelector(self.wake_up)
+        super().__init__(self.selector)
+
+    def call_soon(self, callback, *args, context=None):
+        handle = super().call_soon(callback, *args, context=context)
+        self.wake_up()
+        return handle
+
+    def call_at(self, when, callback, *args, context=None):
+        handle = super().call_at(when, callback, *args, context=context)
+        heapq.heappush(self.pending_timers, (when, next(self.timer_sequence), handle))
+        self.wake_up()
+        return handle
+
+    def wake_up(self):
+        """Runs a loop iteration as soon as control returns to the Qt event loop"""
+        if not self.wakeup_pending:
+            self.wakeup_pending = True
+            self.wakeup_timer.start(0)
+
+    def run_once(self):
+        """Runs a single iteration of the asyncio loop"""
+        if self.is_closed():
+            return
+
+        if self.is_running():
+            # a callback entered a nested Qt event loop, the iteration is
+            # repeated once the running one returned
+            self.wakeup_pending = False
+            self.wakeup_deferred = True
+            return
+
+        self.wakeup_pending = False
+
+        # stopping before running processes all pending I/O events and ready
+        # callbacks exactly once, see the documentation of loop.stop()
+        super().call_soon(self.stop)
+        self.run_forever()
+
+        self.selector.enable_notifiers()
+        if self.wakeup_deferred:
+            self.wakeup_deferred = False
+            self.wake_up()
+            return
+
+        self.schedule_wakeup()
+
+    def schedule_wakeup(self):
+        """Arms the wakeup timer for the next scheduled callback"""
+        if self.wakeup_pending:
+            return
+
+        timers = self.pending_timers
+        while timers and timers[0][2].cancelled():
+            heapq.heappop(timers)
+
+        if not timers:
+            self.wakeup_timer.stop()
+            return
+
+        delay = timers[0][0] - self.time()
+        if delay <= 0:
+            # the callback is either due now or already ran, one more
+            # iteration takes care of both
+            heapq.heappop(timers)
+            self.wake_up()
+            return
+
+        self.wakeup_timer.start(math.ceil(delay * 1000))
+
+    def close(self):
+        self.wakeup_timer.stop()
+        self.pending_timers = []
+        super().close()
@@ -1,6 +1,9 @@
 import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from aiohttp import web
+from .loadqueue import LoadQueue
+from .requestparser import LoadRequestParser
 
 
 class HttpServer:
@@ -11,27 +14,97 @@ class HttpServer:
         self.host = host
         self.port = port
         self.loop = loop
+        # files posted in quick succession are loaded as one batch
+        self.load_queue = LoadQueue(self.main_window.load_files, self.main_window.jobs)
+        # paths are checked off the event loop, slow network mounts would block the gui otherwise
+        self.validation_executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="path-validation"
+        )
 
     def start_server(self):
         webapp = web.Application()
-        webapp.add_routes([web.post("/load_files", self.handle_load_files_request)])
+        webapp.add_routes(
+            [
+                web.post("/load_files", self.handle_load_files_request),
+                web.get("/jobs", self.handle_jobs_request),
+                web.get("/jobs/{job_id}", self.handle_job_request),
+                web.get("/metrics", self.handle_metrics_request),
+            ]
+        )
         runner = web.AppRunner(webapp)
         self.loop.run_until_complete(runner.setup())
         site = web.TCPSite(runner, self.host, self.port)
         self.loop.run_until_complete(site.start())
 
+    @staticmethod
+    def validate_entry(entry) -> dict:
+        """Checks a single entry of the files array, runs on the validation executor"""
+        path = entry.get("path") if isinstance(entry, dict) else None
+        if not isinstance(path, str):
+            return {"path": path, "accepted": False, "reason": "Missing path"}
+
+        path = os.path.normpath(path)
+        if not os.path.exists(path):
+            return {"path": path, "accepted": False, "reason": "File not found"}
+        return {"path": path, "accepted": True, "reason": None}
+
+    async def read_load_request(self, request) -> list[dict]:
+        """Parses the files of a request while it is received and validates them in parallel"""
+        parser = LoadRequestParser()
+        validations = []
+
+        def validate(entries):
+            validations.extend(
+                self.loop.run_in_executor(
+                    self.validation_executor, self.validate_entry, entry
+                )
+                for entry in entries
+            )
+
+        async for chunk in request.content.iter_chunked(64 * 1024):
+            validate(parser.feed(chunk))
+        validate(parser.finish())
+        return await asyncio.gather(*validations)
+
     async def handle_load_files_request(self, request):
         try:
-            data = await request.json()
-            files = [
-                os.path.normpath(file["path"])
-                for file in data["files"]
-                if os.path.exists(os.path.normpath(file["path"]))
-            ]
-            if files:
-                self.main_window.load_files(files)
-                return web.Response(status=200, text="Files loaded successfully")
-            else:
-                return web.Response(status=400, text="No valid files found")
+            results = await self.read_load_request(request)
+        except ValueError as e:
+            return web.Response(status=400, text=f"Invalid request: {str(e)}")
         except Exception as e:
             return web.Response(status=500, text=f"An error occurred: {str(e)}")
+
+        files = [result["path"] for result in results if result["accepted"]]
+        if not files:
+            return web.json_response(
+                status=400,
+                data={"error": "No valid files found", "job": None, "results": results},
+            )
+
+        job = self.load_queue.submit(files)
+        return web.json_response(
+            status=200, data={"job": job.to_dict(), "results": results}
+        )
+
+    def shutdown(self):
+        self.validation_executor.shutdown(wait=False, cancel_futures=True)
+
+    async def handle_jobs_request(self, request):
+        jobs = self.main_window.jobs.get_jobs(request.query.get("status"))
+        return web.json_response({"jobs": [job.to_dict() for job in jobs]})
+
+    async def handle_job_request(self, request):
+        job = self.main_window.jobs.get(request.match_info["job_id"])
+        if job is None:
+            return web.Response(status=404, text="Job not found")
+        return web.json_response(job.to_dict())
+
+    async def handle_metrics_request(self, request):
+        metrics = self.main_window.metrics.render(
+            self.main_window.resolution_cache.stats(),
+            self.main_window.jobs.counts(),
+        )
+        return web.Response(
+            text=metrics,
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
@@ -0,0 +1,85 @@
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+
+class Job:
+    """A load, save or conversion started from the window or through the http server"""
+
+    def __init__(self, kind: str, files: int = 0):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.files = files
+        self.status = "queued"
+        self.stage = None
+        self.progress = 0
+        self.total = 0
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def start(self) -> None:
+        self.status = "running"
+        self.started_at = time.time()
+
+    def update(self, stage: str, progress: int, total: int) -> None:
+        self.stage = stage
+        self.progress = progress
+        self.total = total
+
+    def finish(self, error: str | None = None) -> None:
+        self.status = "failed" if error else "done"
+        self.error = error
+        self.finished_at = time.time()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "files": self.files,
+            "stage": self.stage,
+            "progress": self.progress,
+            "total": self.total,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": self.duration,
+        }
+
+
+class JobRegistry:
+    """Keeps the most recent jobs so clients can poll their status"""
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+
+    def create(self, kind: str, files: int = 0) -> Job:
+        job = Job(kind, files)
+        self.jobs[job.id] = job
+        while len(self.jobs) > self.max_jobs:
+            self.jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def get_jobs(self, status: str | None = None) -> list[Job]:
+        return [
+            job for job in self.jobs.values() if status is None or job.status == status
+        ]
+
+    def running(self) -> list[Job]:
+        return self.get_jobs("running")
+
+    def counts(self) -> dict:
+        return Counter((job.kind, job.status) for job in self.jobs.values())
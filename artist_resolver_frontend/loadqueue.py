@@ -0,0 +1,54 @@
+import asyncio
+from .jobs import Job, JobRegistry
+
+
+class LoadQueue:
+    """
+    Collects the files of load requests that arrive within a short window and
+    loads them as one batch, so many small requests cost as much as a single large one.
+    Only one batch is loaded at a time, requests arriving meanwhile form the next batch.
+    """
+
+    def __init__(self, load, jobs: JobRegistry, window: float = 0.25):
+        self.load = load
+        self.jobs = jobs
+        self.window = window
+        self.pending_files = {}
+        self.pending_jobs = []
+        self.flush_handle = None
+        self.running = None
+
+    def submit(self, files: list[str]) -> Job:
+        """Queues files for the next batch and returns the job tracking them"""
+        job = self.jobs.create("load", len(files))
+
+        # dicts keep the order files were requested in and drop duplicates
+        self.pending_files.update(dict.fromkeys(files))
+        self.pending_jobs.append(job)
+
+        if self.flush_handle is None and self.running is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(
+                self.window, self.flush
+            )
+        return job
+
+    def flush(self) -> None:
+        self.flush_handle = None
+        if not self.pending_jobs:
+            return
+
+        files = list(self.pending_files)
+        jobs = self.pending_jobs
+        self.pending_files = {}
+        self.pending_jobs = []
+        self.running = asyncio.ensure_future(self.run_batch(files, jobs))
+
+    async def run_batch(self, files: list[str], jobs: list[Job]) -> None:
+        """Loads a batch, the load reports status and progress to the jobs of the batch"""
+        try:
+            await self.load(files, jobs)
+        finally:
+            self.running = None
+            if self.pending_jobs:
+                # requests that arrived during the load already waited for a full window
+                self.flush()
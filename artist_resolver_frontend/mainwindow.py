@@ -1,8 +1,13 @@
-import os
 import asyncio
+import copy
+import sys
 import httpx
+import time
 import webbrowser
-from PyQt6.QtCore import Qt, QTimer
+import weakref
+from collections.abc import AsyncIterable
+from contextlib import contextmanager
+from PyQt6.QtCore import Qt, QModelIndex, QTimer
 from PyQt6.QtGui import (
     QKeyEvent,
     QFontDatabase,
@@ -18,13 +23,25 @@ from PyQt6.QtWidgets import (
     QFileDialog,
     QHBoxLayout,
     QGridLayout,
+    QProgressBar,
 )
 from artist_resolver.trackmanager import (
     TrackManager,
     TrackDetails,
 )
 from artist_resolver_frontend import (
-    HttpServer,
+    QtEventLoop,
+    TagReader,
+    TagWriter,
+    DirectoryScanner,
+    ResolutionCache,
+    PersistentResolutionCache,
+    RequestLimiter,
+    Job,
+    JobRegistry,
+    Metrics,
+    ProfilerOverlay,
+    profiled,
     ArtistDelegate,
     ComboBoxDelegate,
     CustomTreeView,
@@ -37,34 +54,77 @@ from artist_resolver_frontend import (
 class MainWindow(QMainWindow):
     stylesheet = "./styles.qss"
     server_port = 23408
-
-    def __init__(self, app, api_host, api_port):
+    # opening more urls at once than this would flood the browser with tabs
+    max_opened_urls = 20
+
+    def __init__(
+        self,
+        app,
+        api_host,
+        api_port,
+        workers=None,
+        cache_size=10000,
+        cache_ttl=3600,
+        cache_file=None,
+        api_concurrency=4,
+        api_retries=3,
+        profiler=None,
+        profile_trace=None,
+    ):
         super().__init__()
 
         self.app = app
-        self.is_closing = False
         self.api_host = api_host
         self.api_port = api_port
+        self.tag_reader = TagReader(workers)
+        self.tag_writer = TagWriter(workers)
+        self.resolution_cache = (
+            PersistentResolutionCache(cache_file, cache_size, cache_ttl)
+            if cache_file
+            else ResolutionCache(cache_size, cache_ttl)
+        )
+        self.request_limiter = RequestLimiter(api_concurrency, api_retries)
+        self.scanners = weakref.WeakSet()
+        self.jobs = JobRegistry()
+        self.metrics = Metrics()
+        self.profiler = profiler
+        self.profile_trace = profile_trace
         self.track_manager = self.create_track_manager()
 
-        # Create and start the asyncio event loop
-        self.loop = asyncio.new_event_loop()
+        # The asyncio event loop is driven by the Qt event dispatcher,
+        # it only runs when a socket, timer or callback is ready
+        self.loop = QtEventLoop()
         asyncio.set_event_loop(self.loop)
 
-        # Use QTimer to periodically run the event loop
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.run_async_tasks)
-        # the loop runs each millisecond, setting the value higher sometimes caused
-        # weird issues where async actions would randomly fail or time out
-        self.timer.start(1)
+        # fonts, the stylesheet, the health check and the local http server
+        # are set up once the window was painted for the first time
+        self.http_server = None
+        self.startup_times = {"created": time.perf_counter()}
 
         self.initUI()
         self.show()
+
+    def view_painted(self) -> None:
+        """Called by the track view after it painted, finishes the startup after the first paint"""
+        if "first_paint" in self.startup_times:
+            return
+
+        self.startup_times["first_paint"] = time.perf_counter()
+        QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self) -> None:
+        QFontDatabase.addApplicationFont("font/NotoSansJP-Regular.ttf")
+        QFontDatabase.addApplicationFont("font/NotoSansJP-Bold.ttf")
+        self.apply_styles()
+
         asyncio.ensure_future(self.check_server_health(), loop=self.loop)
 
+        # aiohttp is only imported once the window is visible
+        from artist_resolver_frontend import HttpServer
+
         self.http_server = HttpServer(self, "localhost", self.server_port, self.loop)
         self.http_server.start_server()
-        app.exec()
+        self.startup_times["ready"] = time.perf_counter()
 
     def apply_styles(self):
         try:
@@ -87,9 +147,18 @@ class MainWindow(QMainWindow):
         self.track_view = CustomTreeView(self)
 
         # Assign the model here to ensure it's created before setting the delegate
-        self.track_model = TrackModel(self.track_manager)
+        self.track_model = TrackModel(
+            self.create_session_track_manager(),
+            self.tag_reader,
+            self.resolution_cache,
+            self.request_limiter,
+            self.tag_writer,
+            self.metrics,
+            self.profiler,
+        )
         self.track_view.setModel(self.track_model)
-        self.track_view.setItemDelegate(ArtistDelegate(self, self.track_model))
+        self.artist_delegate = ArtistDelegate(self, self.track_model)
+        self.track_view.setItemDelegate(self.artist_delegate)
         self.track_view.setItemDelegateForColumn(
             self.track_model.get_artist_column("type"),
             ComboBoxDelegate(self.track_view, self.track_model),
@@ -97,15 +166,16 @@ class MainWindow(QMainWindow):
 
         self.layout.addWidget(self.track_view)
 
+        if self.profiler is not None:
+            # F12 shows the slowest spans of the last seconds, F11 writes the trace file
+            self.profiler_overlay = ProfilerOverlay(self.profiler, self)
+
         self.add_actions_layout()
 
         self.clear_data()
         self.apply_column_width()
 
-        QFontDatabase.addApplicationFont("font/NotoSansJP-Regular.ttf")
-        QFontDatabase.addApplicationFont("font/NotoSansJP-Bold.ttf")
         self.app.setStyle("Fusion")
-        self.apply_styles()
 
         self.setAcceptDrops(True)
 
@@ -117,6 +187,12 @@ class MainWindow(QMainWindow):
 
         buttons_layout = self.create_buttons_layout()
         bottom_layout.addStretch(1)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setFixedWidth(250)
+        self.progress_bar.hide()
+        bottom_layout.addWidget(self.progress_bar)
+
         bottom_layout.addLayout(buttons_layout)
 
         self.layout.addLayout(bottom_layout)
@@ -191,15 +267,25 @@ class MainWindow(QMainWindow):
             )
             return None
 
-    def run_async_tasks(self):
-        """Runs pending asyncio tasks."""
-        if not self.is_closing:
-            self.loop.call_soon_threadsafe(self.loop.stop)
-            self.loop.run_forever()
+    def create_session_track_manager(self) -> TrackManager:
+        """
+        Creates the track manager of a new session as a copy of the track manager of the window.
+        Everything the track manager keeps between requests, like its connections, is shared by
+        all sessions, while each session gets its own list of tracks. Loads of a cleared session
+        that are still running therefore cannot add tracks to the next one.
+        """
+        if self.track_manager is None:
+            return None
 
+        track_manager = copy.copy(self.track_manager)
+        track_manager.tracks = []
+        return track_manager
+
+    @profiled("get_server_health", "api")
     async def check_server_health(self):
         try:
-            api_is_healthy = await self.track_manager.get_server_health()
+            with self.metrics.time_request("health"):
+                api_is_healthy = await self.track_manager.get_server_health()
 
             if not api_is_healthy:
                 self.show_toast(
@@ -220,76 +306,122 @@ class MainWindow(QMainWindow):
                 10000,
             )
 
+    def get_selected_items(self) -> list:
+        """Returns the internal pointers of all selected rows, in the order they were selected"""
+        items = {}
+        for index in self.track_view.selectionModel().selectedRows():
+            if index.isValid():
+                item = index.internalPointer()
+                items.setdefault(id(item), item)
+        return list(items.values())
+
+    def get_selected_tracks(self) -> list:
+        return [
+            item for item in self.get_selected_items() if isinstance(item, TrackDetails)
+        ]
+
     def open_in_musicbrainz(self) -> None:
-        selected_indexes = self.track_view.selectedIndexes()
-        if selected_indexes:
-            selected_index = selected_indexes[0]
-            if selected_index.isValid():
-                item = selected_index.internalPointer()
-                try:
-                    url = self.track_model.get_musicbrainz_url(item)
-                    if url:
-                        webbrowser.open(url)
-                    else:
-                        self.show_toast(
-                            "No URL available for this track.", ToastType.INFO
-                        )
-                except Exception as e:
-                    self.show_toast(f"{str(e)}", ToastType.ERROR, 1000)
+        items = self.get_selected_items()
+        if not items:
+            return
+
+        try:
+            urls = list(
+                dict.fromkeys(
+                    url
+                    for url in map(self.track_model.get_musicbrainz_url, items)
+                    if url
+                )
+            )
+        except Exception as e:
+            self.show_toast(f"{str(e)}", ToastType.ERROR, 1000)
+            return
+
+        if not urls:
+            self.show_toast("No URL available for this track.", ToastType.INFO)
+            return
+
+        for url in urls[: self.max_opened_urls]:
+            webbrowser.open(url)
+
+        if len(urls) > self.max_opened_urls:
+            self.show_toast(
+                f"Opened the first {self.max_opened_urls} of {len(urls)} URLs.",
+                ToastType.INFO,
+            )
 
     def convert_track_to_simple_artist(self) -> None:
-        async def run(track_item):
+        async def run(tracks):
             try:
-                await self.track_model.convert_track_to_simple_artist(
-                    track_item,
-                    self.cb_replace_original_title.isChecked(),
-                    self.cb_overwrite_existing_original_title.isChecked(),
-                    self.cb_replace_original_artist.isChecked(),
-                    self.cb_overwrite_existing_original_artist.isChecked(),
-                )
-                self.track_view.expandAll()
+                with self.run_jobs([self.jobs.create("convert", len(tracks))]):
+                    await self.track_model.convert_tracks_to_simple_artist(
+                        tracks,
+                        self.cb_replace_original_title.isChecked(),
+                        self.cb_overwrite_existing_original_title.isChecked(),
+                        self.cb_replace_original_artist.isChecked(),
+                        self.cb_overwrite_existing_original_artist.isChecked(),
+                    )
             except Exception as e:
                 self.show_toast(f"{str(e)}", ToastType.ERROR, 10000)
 
-        selected_indexes = self.track_view.selectedIndexes()
-        if selected_indexes:
-            selected_index = selected_indexes[0]
-            if selected_index.isValid():
-                track_item = selected_index.internalPointer()
-                if isinstance(track_item, TrackDetails):
-                    asyncio.ensure_future(run(track_item), loop=self.loop)
+        tracks = self.get_selected_tracks()
+        if tracks:
+            asyncio.ensure_future(run(tracks), loop=self.loop)
 
     def save_changes(self) -> None:
         async def run():
             try:
-                await self.track_model.save_files()
-                self.show_toast(
-                    "Successfully updated all files!", ToastType.SUCCESS, 500
-                )
+                job = self.jobs.create("save")
+                with self.run_jobs([job]):
+                    saved_files = job.files = await self.track_model.save_files()
+                if saved_files:
+                    self.show_toast(
+                        "Successfully updated all files!", ToastType.SUCCESS, 500
+                    )
+                else:
+                    self.show_toast("There are no changes to save.", ToastType.INFO)
             except Exception as e:
                 self.show_toast(f"{str(e)}", ToastType.ERROR, 10000)
+            finally:
+                self.progress_bar.hide()
 
         asyncio.ensure_future(run(), loop=self.loop)
 
-    def load_files(self, files: list[str]) -> None:
+    def load_files(
+        self,
+        files: list[str] | AsyncIterable[list[str]],
+        jobs: list[Job] | None = None,
+    ) -> asyncio.Future:
+        if jobs is None:
+            # the number of files of a directory scan is only known once it finished
+            files_count = len(files) if isinstance(files, list) else 0
+            jobs = [self.jobs.create("load", files_count)]
+
         async def load_and_update():
             await self.check_server_health()
 
+            files_loaded = self.metrics.files_loaded
+            start = time.perf_counter()
             try:
-                await self.track_model.load_files(
-                    files,
-                    self.cb_replace_original_title.isChecked(),
-                    self.cb_overwrite_existing_original_title.isChecked(),
-                    self.cb_replace_original_artist.isChecked(),
-                    self.cb_overwrite_existing_original_artist.isChecked(),
-                    True,
+                with self.run_jobs(jobs):
+                    await self.track_model.load_files(
+                        files,
+                        self.cb_replace_original_title.isChecked(),
+                        self.cb_overwrite_existing_original_title.isChecked(),
+                        self.cb_replace_original_artist.isChecked(),
+                        self.cb_overwrite_existing_original_artist.isChecked(),
+                        True,
+                    )
+                self.metrics.load_finished(
+                    self.metrics.files_loaded - files_loaded,
+                    time.perf_counter() - start,
                 )
             except Exception as e:
                 self.show_toast(f"{str(e)}", ToastType.ERROR, 10000)
+            finally:
+                self.progress_bar.hide()
 
-            self.track_view.expandAll()
-
-        asyncio.ensure_future(load_and_update(), loop=self.loop)
+        return asyncio.ensure_future(load_and_update(), loop=self.loop)
 
     def load_files_dialog(self) -> None:
         files, _ = QFileDialog.getOpenFileNames(
@@ -300,10 +432,66 @@ class MainWindow(QMainWindow):
             self.load_files(files)
 
     def clear_data(self) -> TrackModel:
-        self.track_manager = TrackManager(host=self.api_host, port=self.api_port)
-        self.track_model = TrackModel(self.track_manager)
+        self.cancel_scans()
+        self.track_model = TrackModel(
+            self.create_session_track_manager(),
+            self.tag_reader,
+            self.resolution_cache,
+            self.request_limiter,
+            self.tag_writer,
+            self.metrics,
+            self.profiler,
+        )
+        self.track_model.progress_changed.connect(self.show_progress)
+        self.track_model.rowsInserted.connect(self.expand_inserted_rows)
+        self.artist_delegate.set_model(self.track_model)
         self.track_view.setModel(self.track_model)
 
+    @contextmanager
+    def run_jobs(self, jobs: list[Job]):
+        """Marks jobs as running and reports the progress of the model to them until the block exits"""
+        track_model = self.track_model
+
+        def update(stage: str, value: int, total: int) -> None:
+            for job in jobs:
+                job.update(stage, value, total)
+
+        for job in jobs:
+            job.start()
+        track_model.progress_changed.connect(update)
+
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            track_model.progress_changed.disconnect(update)
+            for job in jobs:
+                job.finish(error)
+
+    def show_progress(self, stage: str, value: int, total: int) -> None:
+        # loads of a cleared model keep running until they are cancelled
+        if self.sender() is not self.track_model:
+            return
+
+        # a total of 0 shows a busy indicator
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(value)
+        self.progress_bar.setFormat(f"{stage} %v/%m" if total else stage)
+        self.progress_bar.show()
+
+    @profiled("expand_rows", "view")
+    def expand_inserted_rows(self, parent: QModelIndex, first: int, last: int) -> None:
+        # rows are inserted as they are added or fetched by scrolling, so only new
+        # rows are expanded instead of walking the entire tree with expandAll
+        if parent.isValid() or self.sender() is not self.track_model:
+            return
+
+        for row in range(first, last + 1):
+            self.track_view.expand(self.track_model.index(row, 0))
+
     def show_toast(
         self, message: str, toast_type: ToastType, duration: int = 3000
     ) -> None:
@@ -320,16 +508,24 @@ class MainWindow(QMainWindow):
         for i in range(len(self.track_model.header_names)):
             self.track_view.setColumnWidth(i, self.track_model.columnWidth(i))
 
+    def cancel_scans(self) -> None:
+        for scanner in list(self.scanners):
+            scanner.cancel()
+
     def keyPressEvent(self, event: QKeyEvent) -> None:
+        if event.key() == Qt.Key.Key_Escape:
+            self.cancel_scans()
+
+        if self.profiler is not None and event.key() == Qt.Key.Key_F12:
+            self.profiler_overlay.toggle()
+
+        if self.profiler is not None and event.key() == Qt.Key.Key_F11:
+            self.dump_profile_trace()
+
         if event.key() == Qt.Key.Key_Delete:
-            selected_indexes = self.track_view.selectedIndexes()
-            if selected_indexes:
-                selected_index = selected_indexes[0]
-                if selected_index.isValid():
-                    track_item = selected_index.internalPointer()
-                    if isinstance(track_item, TrackDetails):
-                        self.track_model.remove_track(track_item)
-                        self.track_view.expandAll()
+            tracks = self.get_selected_tracks()
+            if tracks:
+                self.track_model.remove_tracks(tracks)
 
     def moveEvent(self, event):
         if self.toast and self.toast.isVisible():
@@ -339,10 +535,32 @@ class MainWindow(QMainWindow):
         if self.toast and self.toast.isVisible():
             self.toast.update_position(self.geometry())
 
+    def dump_profile_trace(self) -> None:
+        if not self.profile_trace:
+            self.show_toast("No trace file configured.", ToastType.INFO)
+            return
+
+        try:
+            self.profiler.dump_chrome_trace(self.profile_trace)
+            self.show_toast(f"Trace written to {self.profile_trace}", ToastType.INFO)
+        except OSError as e:
+            self.show_toast(f"Could not write trace: {str(e)}", ToastType.ERROR, 10000)
+
     def closeEvent(self, event):
         """Handle the window close event to stop the asyncio event loop and exit the application."""
-        self.is_closing = True
-        self.timer.stop()
+        if self.profiler is not None and self.profile_trace:
+            # the window is gone by now, a failed dump must not skip the shutdown
+            try:
+                self.profiler.dump_chrome_trace(self.profile_trace)
+            except OSError as e:
+                print(f"Could not write trace: {str(e)}", file=sys.stderr)
+        self.cancel_scans()
+        self.tag_reader.shutdown()
+        self.tag_writer.shutdown()
+        if self.http_server is not None:
+            self.http_server.shutdown()
+        if isinstance(self.resolution_cache, PersistentResolutionCache):
+            self.resolution_cache.close()
         self.loop.stop()
         self.loop.close()
         self.app.quit()
@@ -352,17 +570,14 @@ class MainWindow(QMainWindow):
             event.acceptProposedAction()
 
     def dropEvent(self, event: QDropEvent):
-        urls = event.mimeData().urls()
-        files = []
-        for url in urls:
-            local_path = url.toLocalFile()
-            if os.path.isdir(local_path):
-                for root, _, filenames in os.walk(local_path):
-                    for filename in filenames:
-                        if filename.lower().endswith(".mp3"):
-                            files.append(os.path.join(root, filename))
-            elif os.path.isfile(local_path) and local_path.lower().endswith(".mp3"):
-                files.append(local_path)
-
-        if files:
-            self.load_files(files)
+        paths = [
+            url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()
+        ]
+        if not paths:
+            return
+
+        # directories are walked on a worker thread, found files are loaded while
+        # the scan is still running. Pressing escape or clearing cancels the scan
+        scanner = DirectoryScanner(paths)
+        self.scanners.add(scanner)
+        self.load_files(scanner.scan())
@@ -0,0 +1,168 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Histogram:
+    """Cumulative histogram of observed values, rendered in the Prometheus text format"""
+
+    default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, buckets: tuple = default_buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def render(self, name: str, labels: str) -> list[str]:
+        separator = "," if labels else ""
+        lines = [
+            f'{name}_bucket{{{labels}{separator}le="{bound}"}} {count}'
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class Metrics:
+    """
+    Collects the numbers reported by the instrumentation hooks of the model and the window.
+    All hooks run on the event loop, so no locking is required.
+    """
+
+    prefix = "artist_resolver"
+
+    def __init__(self):
+        self.request_durations = defaultdict(Histogram)
+        self.request_errors = defaultdict(int)
+        self.files_loaded = 0
+        self.files_saved = 0
+        self.model_refreshes = 0
+        self.last_load_files_per_second = 0.0
+
+    @contextmanager
+    def time_request(self, operation: str):
+        """Records the duration of an API call, failed calls are counted separately"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.request_errors[operation] += 1
+            raise
+        finally:
+            self.request_durations[operation].observe(time.perf_counter() - start)
+
+    def files_read(self, count: int) -> None:
+        self.files_loaded += count
+
+    def files_written(self, count: int) -> None:
+        self.files_saved += count
+
+    def model_refreshed(self) -> None:
+        self.model_refreshes += 1
+
+    def load_finished(self, files: int, duration: float) -> None:
+        if duration > 0:
+            self.last_load_files_per_second = files / duration
+
+    def render(self, cache_stats: dict | None = None, job_counts: dict | None = None):
+        """Renders all metrics in the Prometheus text exposition format"""
+        prefix = self.prefix
+        lines = []
+
+        def add(name, metric_type, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            lines.extend(samples)
+
+        add(
+            "files_loaded_total",
+            "counter",
+            "Number of files read into the model.",
+            [f"{prefix}_files_loaded_total {self.files_loaded}"],
+        )
+        add(
+            "last_load_files_per_second",
+            "gauge",
+            "Throughput of the last finished load.",
+            [f"{prefix}_last_load_files_per_second {self.last_load_files_per_second}"],
+        )
+        add(
+            "files_saved_total",
+            "counter",
+            "Number of files written successfully.",
+            [f"{prefix}_files_saved_total {self.files_saved}"],
+        )
+        add(
+            "model_refreshes_total",
+            "counter",
+            "Number of times the model index was rebuilt from the track manager.",
+            [f"{prefix}_model_refreshes_total {self.model_refreshes}"],
+        )
+        add(
+            "api_request_duration_seconds",
+            "histogram",
+            "Duration of requests to the artist resolver API.",
+            [
+                line
+                for operation, histogram in sorted(self.request_durations.items())
+                for line in histogram.render(
+                    f"{prefix}_api_request_duration_seconds",
+                    f'operation="{operation}"',
+                )
+            ],
+        )
+        add(
+            "api_request_errors_total",
+            "counter",
+            "Number of failed requests to the artist resolver API.",
+            [
+                f'{prefix}_api_request_errors_total{{operation="{operation}"}} {count}'
+                for operation, count in sorted(self.request_errors.items())
+            ],
+        )
+
+        if cache_stats is not None:
+            add(
+                "cache_lookups_total",
+                "counter",
+                "Lookups in the artist resolution cache.",
+                [
+                    f'{prefix}_cache_lookups_total{{result="hit"}} {cache_stats["hits"]}',
+                    f'{prefix}_cache_lookups_total{{result="miss"}} {cache_stats["misses"]}',
+                ],
+            )
+            add(
+                "cache_hit_ratio",
+                "gauge",
+                "Share of cache lookups that were hits.",
+                [f"{prefix}_cache_hit_ratio {cache_stats['hit_rate']}"],
+            )
+            add(
+                "cache_entries",
+                "gauge",
+                "Number of artists held in the resolution cache.",
+                [f"{prefix}_cache_entries {cache_stats['entries']}"],
+            )
+
+        if job_counts is not None:
+            add(
+                "jobs",
+                "gauge",
+                "Number of known jobs by kind and status.",
+                [
+                    f'{prefix}_jobs{{kind="{kind}",status="{status}"}} {count}'
+                    for (kind, status), count in sorted(job_counts.items())
+                ],
+            )
+
+        return "\n".join(lines) + "\n"
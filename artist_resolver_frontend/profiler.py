@@ -0,0 +1,108 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+class Profiler:
+    """
+    Records timing spans of hot paths into a rolling in-memory buffer.
+    The buffer can be summarized for the debug overlay or dumped as a Chrome trace,
+    which can be opened in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(self, max_spans: int = 100000):
+        # appending to a deque is thread safe, spans can be recorded from workers
+        self.spans = deque(maxlen=max_spans)
+        self.origin = time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str, category: str = "app", **args):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.spans.append(
+                (
+                    name,
+                    category,
+                    start,
+                    time.perf_counter_ns() - start,
+                    threading.get_ident(),
+                    args,
+                )
+            )
+
+    def summarize(self, seconds: float = 10.0) -> list[dict]:
+        """Aggregates the spans of the last seconds by name, slowest total first"""
+        since = time.perf_counter_ns() - int(seconds * 1e9)
+        durations = defaultdict(list)
+        for name, _, start, duration, _, _ in list(self.spans):
+            if start >= since:
+                durations[name].append(duration)
+
+        summary = [
+            {
+                "name": name,
+                "count": len(values),
+                "total_ms": sum(values) / 1e6,
+                "mean_ms": sum(values) / len(values) / 1e6,
+                "max_ms": max(values) / 1e6,
+            }
+            for name, values in durations.items()
+        ]
+        return sorted(summary, key=lambda entry: entry["total_ms"], reverse=True)
+
+    def get_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self.origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": thread,
+                    "args": args,
+                }
+                for name, category, start, duration, thread, args in list(self.spans)
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def dump_chrome_trace(self, file_path: str) -> None:
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(self.get_chrome_trace(), file)
+
+
+def profiled(name: str, category: str = "model"):
+    """Records a span for every call of a method, if the profiler attribute of its instance is set"""
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                if self.profiler is None:
+                    return await method(self, *args, **kwargs)
+                with self.profiler.span(name, category):
+                    return await method(self, *args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.profiler is None:
+                return method(self, *args, **kwargs)
+            with self.profiler.span(name, category):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
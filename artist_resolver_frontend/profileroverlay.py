@@ -0,0 +1,47 @@
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFontDatabase
+from PyQt6.QtWidgets import QLabel
+
+
+class ProfilerOverlay(QLabel):
+    """Shows the slowest spans of the last seconds on top of the window"""
+
+    def __init__(self, profiler, parent=None, seconds: float = 10.0):
+        super().__init__(parent)
+        self.profiler = profiler
+        self.seconds = seconds
+
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 180); color: white; padding: 6px;"
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.hide()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+
+    def toggle(self) -> None:
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+            return
+
+        self.refresh()
+        self.show()
+        self.raise_()
+        self.timer.start()
+
+    def refresh(self) -> None:
+        lines = [
+            f"{'span':<28}{'count':>7}{'total ms':>11}{'mean ms':>10}{'max ms':>10}"
+        ]
+        for entry in self.profiler.summarize(self.seconds)[:15]:
+            lines.append(
+                f"{entry['name'][:27]:<28}{entry['count']:>7}"
+                f"{entry['total_ms']:>11.1f}{entry['mean_ms']:>10.2f}{entry['max_ms']:>10.2f}"
+            )
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.move(self.parentWidget().width() - self.width() - 10, 10)
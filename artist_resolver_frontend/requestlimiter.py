@@ -0,0 +1,42 @@
+import asyncio
+import httpx
+
+
+class RequestLimiter:
+    """
+    Limits how many requests to the API run at the same time.
+    Callers wait for a free slot, which keeps bulk operations from overwhelming
+    a shared server. Requests that are safe to repeat are retried with
+    exponential backoff on connection errors and temporary server errors.
+    """
+
+    retry_status_codes = {429, 502, 503, 504}
+
+    def __init__(
+        self, max_concurrency: int = 4, retries: int = 3, backoff: float = 0.5
+    ):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.retries = retries
+        self.backoff = backoff
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, httpx.TransportError):
+            return True
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self.retry_status_codes
+        return False
+
+    async def run(self, request, retry: bool = False):
+        """Awaits the coroutine returned by request once a slot is free"""
+        async with self.semaphore:
+            attempt = 0
+            while True:
+                try:
+                    return await request()
+                except Exception as e:
+                    if not retry or attempt >= self.retries:
+                        raise
+                    if not self.is_retryable(e):
+                        raise
+                await asyncio.sleep(self.backoff * 2**attempt)
+                attempt += 1
@@ -0,0 +1,141 @@
+import codecs
+import json
+
+
+class LoadRequestParser:
+    """
+    Incrementally parses the JSON body of a load request, {"files": [{"path": ...}, ...]}.
+    Body chunks are fed as they arrive and the entries of the files array are returned
+    as soon as they are complete, so large requests are never held in memory as a whole.
+    """
+
+    whitespace = " \t\n\r"
+    # characters that can follow a complete value
+    delimiters = whitespace + ",}]"
+
+    # largest single value that is buffered while waiting for the rest of it
+    max_value_size = 1024 * 1024
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.position = 0
+        self.state = "start"
+        self.key = None
+        self.eof = False
+
+    def feed(self, data: bytes) -> list:
+        """Adds a chunk of the body and returns the entries of the files array completed by it"""
+        self.buffer += self.text_decoder.decode(data)
+        return self.parse()
+
+    def finish(self) -> list:
+        """Parses the rest of the body, raises a ValueError if the body is incomplete"""
+        self.buffer += self.text_decoder.decode(b"", final=True)
+        self.eof = True
+        entries = self.parse()
+        if self.state != "done":
+            raise ValueError("Incomplete JSON document")
+        return entries
+
+    def skip_whitespace(self) -> str | None:
+        """Moves past whitespace and returns the next character, None if more data is needed"""
+        while self.position < len(self.buffer):
+            char = self.buffer[self.position]
+            if char not in self.whitespace:
+                return char
+            self.position += 1
+        return None
+
+    def expect(self, char: str, expected: str) -> None:
+        if char not in expected:
+            raise ValueError(
+                f"Expected one of {expected!r} at position {self.position}, found {char!r}"
+            )
+        self.position += 1
+
+    def decode_value(self):
+        """Decodes the next complete value, returns a (False, None) tuple if more data is needed"""
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.position)
+        except json.JSONDecodeError:
+            if self.eof:
+                raise
+            if len(self.buffer) - self.position > self.max_value_size:
+                raise ValueError("Value in request exceeds the maximum size")
+            return False, None
+
+        # a number that is not followed by a delimiter yet might continue in the next chunk,
+        # 1. or 1e are decoded as 1 and the rest of them would be rejected
+        if (
+            not self.eof
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and (end == len(self.buffer) or self.buffer[end] not in self.delimiters)
+        ):
+            if len(self.buffer) - self.position > self.max_value_size:
+                raise ValueError("Value in request exceeds the maximum size")
+            return False, None
+
+        self.position = end
+        return True, value
+
+    def parse(self) -> list:
+        entries = []
+        while True:
+            char = self.skip_whitespace()
+            if char is None:
+                break
+
+            if self.state == "start":
+                self.expect(char, "{")
+                self.state = "key_or_end"
+            elif self.state in ("key", "key_or_end"):
+                if char == "}" and self.state == "key_or_end":
+                    self.position += 1
+                    self.state = "done"
+                    continue
+                complete, key = self.decode_value()
+                if not complete:
+                    break
+                if not isinstance(key, str):
+                    raise ValueError(f"Expected an object key, found {key!r}")
+                self.key = key
+                self.state = "colon"
+            elif self.state == "colon":
+                self.expect(char, ":")
+                self.state = "files" if self.key == "files" else "value"
+            elif self.state == "value":
+                complete, _ = self.decode_value()
+                if not complete:
+                    break
+                self.state = "key_separator"
+            elif self.state == "key_separator":
+                self.expect(char, ",}")
+                self.state = "key" if char == "," else "done"
+            elif self.state == "files":
+                self.expect(char, "[")
+                self.state = "entry_or_end"
+            elif self.state in ("entry", "entry_or_end"):
+                if char == "]" and self.state == "entry_or_end":
+                    self.position += 1
+                    self.state = "key_separator"
+                    continue
+                complete, entry = self.decode_value()
+                if not complete:
+                    break
+                entries.append(entry)
+                self.state = "entry_separator"
+            elif self.state == "entry_separator":
+                self.expect(char, ",]")
+                self.state = "entry" if char == "," else "key_separator"
+            else:
+                raise ValueError(
+                    f"Unexpected data after JSON document at position {self.position}"
+                )
+
+        # drop the parsed part of the buffer
+        self.buffer = self.buffer[self.position :]
+        self.position = 0
+        return entries
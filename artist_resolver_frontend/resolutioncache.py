@@ -0,0 +1,241 @@
+import copy
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from artist_resolver.trackmanager import (
+    MbArtistDetails,
+    SimpleArtistDetails,
+)
+
+
+class ResolutionCache:
+    """
+    Remembers the data the server returned for artists across loads.
+    Entries are keyed by mbid for musicbrainz artists and by name for simple artists,
+    expire after ttl seconds and are evicted least recently used first once max_size is reached.
+
+    The cached data of an artist are all attributes owned by the server, not only the ones
+    that differed from the tags of the file the artist was first read from.
+    Besides the known server fields, every attribute update_artists_info_from_db is seen
+    changing on an artist is treated as owned by the server from then on.
+    """
+
+    # attributes the server fills in on every artist it knows
+    default_server_fields = ("id", "include", "custom_name", "has_server_data")
+
+    def __init__(self, max_size: int = 10000, ttl: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.server_fields = set(self.default_server_fields)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(artist) -> tuple[str, str] | None:
+        if isinstance(artist, SimpleArtistDetails):
+            return ("name", artist.name) if artist.name else None
+        if isinstance(artist, MbArtistDetails):
+            return ("mbid", artist.mbid) if artist.mbid else None
+        return None
+
+    @classmethod
+    def is_plain(cls, value) -> bool:
+        """Checks if a value only consists of primitives that can be copied into other artists"""
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return True
+        if isinstance(value, (list, tuple)):
+            return all(cls.is_plain(item) for item in value)
+        if isinstance(value, dict):
+            return all(
+                isinstance(key, str) and cls.is_plain(item)
+                for key, item in value.items()
+            )
+        return False
+
+    def load(self, key) -> tuple[float, dict] | None:
+        """Loads an entry that is not held in memory, the in-memory cache has no other source"""
+        return None
+
+    def needs_revalidation(self, artist) -> bool:
+        """Checks if the cached data of an artist should be refreshed from the server"""
+        return False
+
+    def get(self, key) -> dict | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.load(key)
+            if entry is not None:
+                self.add_entry(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, data = entry
+        if time.time() - stored_at > self.ttl:
+            del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def add_entry(self, key, entry: tuple[float, dict]) -> None:
+        """Adds an entry to the in-memory cache, evicting the least recently used ones"""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def put(self, key, data: dict) -> None:
+        self.add_entry(key, (time.time(), data))
+
+    def invalidate(self, keys=None) -> None:
+        """Removes the given keys from the cache, or all entries if no keys are passed"""
+        if keys is None:
+            self.entries.clear()
+            return
+
+        for key in keys:
+            self.entries.pop(key, None)
+
+    def apply(self, artists: list) -> list:
+        """Applies cached server data to artists and returns the artists that were not cached"""
+        missing = []
+        for artist in artists:
+            key = self.get_key(artist)
+            data = self.get(key) if key else None
+            if data is None:
+                missing.append(artist)
+                continue
+
+            for name, value in copy.deepcopy(data).items():
+                setattr(artist, name, value)
+        return missing
+
+    def snapshot(self, artists: list) -> list:
+        """Records the state of artists before they are updated from the server"""
+        return [
+            (artist, self.get_key(artist), dict(vars(artist))) for artist in artists
+        ]
+
+    def store(self, snapshots: list) -> None:
+        """Stores the server owned attributes of artists that were updated since the snapshot was taken"""
+        for artist, _, before in snapshots:
+            self.server_fields.update(
+                name
+                for name, value in vars(artist).items()
+                if name not in before or before[name] != value
+            )
+
+        for artist, key, _ in snapshots:
+            if key is None:
+                continue
+
+            # values the server returned that equal the tags are stored as well,
+            # other tracks of the same artist may carry different tags
+            values = vars(artist)
+            if values.get("has_server_data", True):
+                data = {
+                    name: values[name] for name in self.server_fields if name in values
+                }
+            else:
+                # the server does not know the artist, all of its values come from the tags
+                data = {"has_server_data": False}
+            if self.is_plain(data):
+                self.put(key, copy.deepcopy(data))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class PersistentResolutionCache(ResolutionCache):
+    """
+    Resolution cache that is backed by a SQLite database, so artists resolved in
+    earlier sessions are available right away. Entries read from disk are served
+    immediately and flagged for revalidation against the server.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        max_size: int = 10000,
+        ttl: float = 3600,
+        max_age: float = 30 * 24 * 3600,
+    ):
+        super().__init__(max_size, ttl)
+        self.max_age = max_age
+        self.stale_keys = set()
+
+        self.connection = sqlite3.connect(file_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS artists (
+                key_type TEXT NOT NULL,
+                key TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (key_type, key)
+            ) WITHOUT ROWID
+            """
+        )
+        self.connection.execute(
+            "DELETE FROM artists WHERE stored_at < ?", (time.time() - max_age,)
+        )
+        self.connection.commit()
+
+    def load(self, key) -> tuple[float, dict] | None:
+        row = self.connection.execute(
+            "SELECT stored_at, data FROM artists WHERE key_type = ? AND key = ?", key
+        ).fetchone()
+        if row is None or time.time() - row[0] > self.max_age:
+            return None
+
+        # entries from earlier sessions are used right away but refreshed in the background
+        self.stale_keys.add(key)
+        return time.time(), json.loads(row[1])
+
+    def needs_revalidation(self, artist) -> bool:
+        return self.get_key(artist) in self.stale_keys
+
+    def put(self, key, data: dict) -> None:
+        super().put(key, data)
+        self.stale_keys.discard(key)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO artists (key_type, key, stored_at, data) "
+            "VALUES (?, ?, ?, ?)",
+            (*key, time.time(), json.dumps(data)),
+        )
+
+    def store(self, snapshots: list) -> None:
+        super().store(snapshots)
+        self.connection.commit()
+
+    def invalidate(self, keys=None) -> None:
+        if keys is not None:
+            keys = [key for key in keys if key is not None]
+
+        super().invalidate(keys)
+        if keys is None:
+            self.stale_keys.clear()
+            self.connection.execute("DELETE FROM artists")
+        else:
+            self.stale_keys.difference_update(keys)
+            self.connection.executemany(
+                "DELETE FROM artists WHERE key_type = ? AND key = ?", keys
+            )
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
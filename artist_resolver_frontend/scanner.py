@@ -0,0 +1,89 @@
+import asyncio
+import os
+import threading
+
+
+class DirectoryScanner:
+    """
+    Walks dropped files and directories on a worker thread
+    and streams the paths of all mp3 files it finds in batches.
+    """
+
+    extensions = (".mp3",)
+    batch_size = 200
+
+    def __init__(self, paths: list[str]):
+        self.paths = paths
+        self.cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Stops the scan, batches that were already found are still delivered"""
+        self.cancelled.set()
+
+    def is_mp3(self, path: str) -> bool:
+        return path.lower().endswith(self.extensions)
+
+    def walk(self, emit) -> None:
+        """Walks all paths depth first, passing found files to emit in batches"""
+        seen = set()
+        batch = []
+
+        def add(path):
+            path = os.path.normpath(path)
+            if path not in seen:
+                seen.add(path)
+                batch.append(path)
+
+        try:
+            stack = list(reversed(self.paths))
+            while stack and not self.cancelled.is_set():
+                path = stack.pop()
+                if not os.path.isdir(path):
+                    if os.path.isfile(path) and self.is_mp3(path):
+                        add(path)
+                    continue
+
+                try:
+                    with os.scandir(path) as entries:
+                        entries = sorted(entries, key=lambda entry: entry.name)
+                except OSError:
+                    # unreadable directories are skipped, same as os.walk does
+                    continue
+
+                directories = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            directories.append(entry.path)
+                        elif entry.is_file() and self.is_mp3(entry.name):
+                            add(entry.path)
+                    except OSError:
+                        continue
+
+                    if len(batch) >= self.batch_size:
+                        emit(batch)
+                        batch = []
+
+                stack.extend(reversed(directories))
+
+            if batch:
+                emit(batch)
+        finally:
+            emit(None)
+
+    async def scan(self):
+        """Yields batches of file paths while the scan is running"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def emit(batch):
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(queue.put_nowait, batch)
+
+        walker = loop.run_in_executor(None, self.walk, emit)
+        try:
+            while (batch := await queue.get()) is not None:
+                yield batch
+            await walker
+        finally:
+            self.cancel()
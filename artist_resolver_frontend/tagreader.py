@@ -0,0 +1,76 @@
+import asyncio
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TagReader:
+    """
+    Reads the tags of files without blocking the event loop.
+    A pool of workers fetches the tag data of upcoming files from disk in parallel,
+    while a single loader thread parses them into a scratch copy of the track manager.
+    The scratch copy starts with a snapshot of the loaded tracks so artists are shared
+    with them. The track manager is not thread safe, so only the parsed tracks are handed
+    back to the event loop, which merges them into the track manager the window works with.
+    """
+
+    # size of the ID3v2 header, which contains the size of the tag that follows it
+    id3_header_size = 10
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.prefetch_executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="tag-prefetch"
+        )
+        self.loader_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tag-loader"
+        )
+
+    @classmethod
+    def prefetch_file(cls, file_path: str) -> None:
+        """Reads the ID3v2 tag of a file so it is served from the page cache when parsed"""
+        try:
+            with open(file_path, "rb") as file:
+                header = file.read(cls.id3_header_size)
+                if len(header) < cls.id3_header_size or not header.startswith(b"ID3"):
+                    return
+
+                # the tag size is stored as a 28 bit synchsafe integer
+                size = 0
+                for byte in header[6:10]:
+                    size = (size << 7) | (byte & 0x7F)
+                file.read(size)
+        except OSError:
+            # unreadable files are reported by the track manager when it parses them
+            pass
+
+    def prefetch(self, files: list[str]) -> asyncio.Future:
+        """Starts fetching the tags of all files on the worker pool"""
+        loop = asyncio.get_running_loop()
+        return asyncio.gather(
+            *(
+                loop.run_in_executor(self.prefetch_executor, self.prefetch_file, file)
+                for file in files
+            )
+        )
+
+    async def read_tracks(
+        self, track_manager, files: list[str], read_artist_json: bool
+    ) -> list:
+        """Parses files on the loader thread and returns their tracks, track_manager is not modified"""
+        scratch_manager = copy.copy(track_manager)
+        # the loaded tracks are needed to reuse their artists for the new ones
+        scratch_manager.tracks = list(track_manager.tracks)
+        existing_tracks = len(scratch_manager.tracks)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.loader_executor,
+            asyncio.run,
+            scratch_manager.load_files(files, read_artist_json),
+        )
+        return scratch_manager.tracks[existing_tracks:]
+
+    def shutdown(self):
+        self.prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        self.loader_executor.shutdown(wait=False, cancel_futures=True)
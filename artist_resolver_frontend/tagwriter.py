@@ -0,0 +1,75 @@
+import asyncio
+import copy
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TagWriter:
+    """
+    Writes the tags of tracks on a pool of workers.
+    The tags are written to a temporary copy next to each file, which is then renamed
+    over the original. A failed or interrupted save never leaves a file half written.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="tag-writer"
+        )
+
+    @staticmethod
+    def save_track(track_manager, track) -> None:
+        """Saves a single track through a copy of the track manager that only holds this track"""
+        directory, file_name = os.path.split(track.file_path)
+        temp_handle, temp_path = tempfile.mkstemp(
+            prefix=f".{file_name}.",
+            suffix=os.path.splitext(file_name)[1],
+            dir=directory,
+        )
+        os.close(temp_handle)
+
+        # the copy of the track points to the temporary file, the track itself is left untouched
+        temp_track = copy.copy(track)
+        temp_track.file_path = temp_path
+        track_manager = copy.copy(track_manager)
+        track_manager.tracks = [temp_track]
+
+        try:
+            shutil.copy2(track.file_path, temp_path)
+            asyncio.run(track_manager.save_files())
+            os.replace(temp_path, track.file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    async def save_tracks(self, track_manager, tracks: list, on_progress=None) -> list:
+        """
+        Saves all tracks in parallel and returns a (track, error) tuple for every track
+        that could not be saved. on_progress is called with the number of finished tracks.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def save(track):
+            try:
+                await loop.run_in_executor(
+                    self.executor, self.save_track, track_manager, track
+                )
+                return track, None
+            except Exception as e:
+                return track, e
+
+        errors = []
+        finished = 0
+        for result in asyncio.as_completed([save(track) for track in tracks]):
+            track, error = await result
+            if error is not None:
+                errors.append((track, error))
+            finished += 1
+            if on_progress:
+                on_progress(finished)
+        return errors
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,12 +1,89 @@
+import asyncio
+import copy
+import os
+from collections.abc import AsyncIterable
+from contextlib import nullcontext
+from functools import reduce
+from operator import attrgetter, or_
 from artist_resolver.trackmanager import (
     TrackDetails,
     MbArtistDetails,
     SimpleArtistDetails,
 )
-from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, pyqtSignal
+from .profiler import profiled
+
+
+class TrackNode:
+    """Index entry of a track row, holding its row and the nodes of its artist rows"""
+
+    __slots__ = ("track", "row", "children", "children_fetched")
+
+    def __init__(self, track, row: int):
+        self.track = track
+        self.row = row
+        self.children = self.create_children()
+        # artist rows are only exposed to views once the track is expanded
+        self.children_fetched = False
+
+    def create_children(self) -> list:
+        return [
+            ArtistNode(self, artist, child_row)
+            for child_row, artist in enumerate(self.track.artist_details)
+        ]
+
+    def children_match(self) -> bool:
+        """Checks if the artist nodes still reflect the artist details of the track"""
+        artists = self.track.artist_details
+        return len(artists) == len(self.children) and all(
+            child.artist is artist for child, artist in zip(self.children, artists)
+        )
+
+
+class ArtistNode:
+    """Index entry of an artist row, used as internal pointer of artist indexes"""
+
+    __slots__ = ("parent", "artist", "row")
+
+    def __init__(self, parent: TrackNode, artist, row: int):
+        self.parent = parent
+        self.artist = artist
+        self.row = row
+
+
+class ColumnSpec:
+    """Column mapping compiled into the structures data(), setData() and flags() look up per call"""
+
+    __slots__ = ("property", "roles", "flags", "get_value")
+
+    def __init__(self, column_mapping: dict):
+        self.property = column_mapping["property"]
+        self.roles = frozenset(column_mapping.get("roles", []))
+        self.flags = reduce(
+            or_, column_mapping.get("flags", []), Qt.ItemFlag.NoItemFlags
+        )
+        self.get_value = attrgetter(self.property) if self.property else None
+
+    @classmethod
+    def compile(cls, column_mappings: list) -> tuple:
+        return tuple(cls(column_mapping) for column_mapping in column_mappings)
 
 
 class TrackModel(QAbstractItemModel):
+    # emitted with the current stage, the number of processed items and the total
+    progress_changed = pyqtSignal(str, int, int)
+
+    # number of files that are read before their rows are added to the model
+    load_chunk_size = 200
+
+    # number of track rows that are exposed to views at once,
+    # views fetch more rows once they are scrolled to the end
+    fetch_batch_size = 500
+
+    # number of tracks whose artists are resolved with a single request,
+    # batches run concurrently within the limits of the request limiter
+    resolve_batch_size = 50
+
     header_names = [
         {"display_name": "Title", "width": 100},
         {"display_name": "Type", "width": 100},
@@ -122,92 +199,614 @@ class TrackModel(QAbstractItemModel):
         },
     ]
 
-    def __init__(self, track_manager):
+    track_columns = ColumnSpec.compile(track_column_mappings)
+    artist_columns = ColumnSpec.compile(artist_column_mappings)
+
+    def __init__(
+        self,
+        track_manager,
+        tag_reader=None,
+        resolution_cache=None,
+        request_limiter=None,
+        tag_writer=None,
+        metrics=None,
+        profiler=None,
+    ):
         super().__init__()
         self.track_manager = track_manager
-        self.track_index = []
-
+        self.tag_reader = tag_reader
+        self.resolution_cache = resolution_cache
+        self.request_limiter = request_limiter
+        self.tag_writer = tag_writer
+        self.metrics = metrics
+        self.profiler = profiler
+        self.save_errors = {}
+        # tracks whose files need to be written and tracks whose artists
+        # need to be sent to the server, keyed by track identity
+        self.dirty_tracks = {}
+        self.unsent_tracks = {}
+        # artists that were resolved, keyed by artist identity
+        self.resolved_artists = {}
+        self.revalidation = None
+        self.stale_artists = []
+        self.track_nodes = []
+        self.track_index = {}
+        # number of track nodes that are exposed to views as rows
+        self.fetched_rows = 0
+        self.file_paths = set()
+
+    @profiled("create_unique_artist_index")
     def create_unique_artist_index(self):
         """
-        Creates a list containing all tracks and artists.
-        This is required to uniquely identify artist rows as they can be referenced in multiple tracks
+        Brings the track and artist nodes in line with the tracks of the track manager.
+        This is required to uniquely identify artist rows as they can be referenced in multiple tracks.
+        Nodes are keyed by track identity so lookups stay constant-time regardless of session size,
+        and rows are inserted, removed and updated individually instead of resetting the model.
         """
 
-        self.track_index = []
-        for track in self.track_manager.tracks:
-            for artist in track.artist_details:
-                self.track_index.append({"track": track, "artist": artist})
+        if self.metrics is not None:
+            self.metrics.model_refreshed()
+
+        manager_tracks = {id(track) for track in self.track_manager.tracks}
+        self.remove_track_nodes(
+            [node for node in self.track_nodes if id(node.track) not in manager_tracks]
+        )
 
-    def get_unique_artist(self, track, artist):
-        """Retrieves the unique index of a track-artist combination"""
-        for index, track_info in enumerate(self.track_index):
-            if track_info["track"] == track and track_info["artist"] == artist:
-                return index, track_info
-        return None, None
+        self.insert_tracks(self.track_manager.tracks)
+
+        for node in self.track_nodes:
+            self.refresh_track_node(node)
+
+        if self.fetched_rows:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.fetched_rows - 1, self.columnCount() - 1),
+            )
+
+    def span(self, name: str, category: str = "model", **args):
+        """Records a profiling span, if profiling is enabled"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.span(name, category, **args)
+
+    def time_request(self, operation: str):
+        """Reports the duration of an API call to the metrics, if they are collected"""
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.time_request(operation)
+
+    def get_track_node(self, track) -> TrackNode | None:
+        """Retrieves the index node of a track"""
+        return self.track_index.get(id(track))
+
+    def get_tracks_of_artist(self, artist) -> list:
+        """Retrieves all tracks an artist is part of, artists can be shared between tracks"""
+        return [
+            node.track
+            for node in self.track_nodes
+            if any(child.artist is artist for child in node.children)
+        ]
+
+    def mark_dirty(self, tracks):
+        """Flags tracks to be sent to the server and written with the next save"""
+        for track in tracks:
+            self.dirty_tracks[id(track)] = track
+            self.unsent_tracks[id(track)] = track
+
+    def mark_unsent(self, tracks):
+        """Flags tracks to be sent to the server with the next save, without writing their files"""
+        for track in tracks:
+            self.unsent_tracks[id(track)] = track
+
+    def get_track_state(self, track) -> tuple:
+        """Records the attributes of a track and its artists, so later changes can be detected"""
+        return dict(vars(track)), [
+            dict(vars(artist)) for artist in track.artist_details
+        ]
+
+    def mark_changed_tracks_dirty(self, states: dict):
+        """
+        Flags all tracks whose state differs from the state recorded earlier.
+        states maps track identities to (track, state) tuples.
+        """
+        self.mark_dirty(
+            track
+            for track, state in states.values()
+            if self.get_track_state(track) != state
+        )
+
+    def create_partial_track_manager(self, tracks: list):
+        """Creates a copy of the track manager that only holds the given tracks"""
+        track_manager = copy.copy(self.track_manager)
+        track_manager.tracks = tracks
+        return track_manager
+
+    def insert_tracks(self, tracks):
+        """Appends rows for all tracks that are not part of the model yet"""
+        new_tracks = [track for track in tracks if id(track) not in self.track_index]
+        if not new_tracks:
+            return
+
+        for row, track in enumerate(new_tracks, len(self.track_nodes)):
+            node = TrackNode(track, row)
+            self.track_nodes.append(node)
+            self.track_index[id(track)] = node
+            self.file_paths.add(os.path.normpath(track.file_path))
+
+        # added tracks are shown right away while all rows fit into the
+        # first batch, further rows are fetched once views scroll to them
+        if self.fetched_rows < self.fetch_batch_size:
+            self.expose_rows(self.fetch_batch_size - self.fetched_rows)
+
+    def expose_rows(self, count: int):
+        """Exposes up to count track nodes that were not fetched yet as rows"""
+        count = min(count, len(self.track_nodes) - self.fetched_rows)
+        if count <= 0:
+            return
+
+        first_row = self.fetched_rows
+        self.beginInsertRows(QModelIndex(), first_row, first_row + count - 1)
+        self.fetched_rows += count
+        self.endInsertRows()
+
+    def is_row_fetched(self, node: TrackNode) -> bool:
+        return node.row < self.fetched_rows
+
+    def remove_track_nodes(self, nodes: list[TrackNode]):
+        """Removes the rows of several track nodes, each contiguous range of rows at once"""
+        ranges = []
+        for row in sorted({node.row for node in nodes}, reverse=True):
+            if ranges and ranges[-1][0] == row + 1:
+                ranges[-1][0] = row
+            else:
+                ranges.append([row, row])
+
+        # ranges are removed bottom up, so the rows of the remaining ranges stay valid
+        for first, last in ranges:
+            self.remove_track_rows(first, last)
+
+    def remove_track_rows(self, first: int, last: int):
+        """Removes a contiguous range of track rows and shifts all following rows up"""
+        fetched_last = min(last, self.fetched_rows - 1)
+        fetched = first <= fetched_last
+
+        # the nodes are kept referenced until endRemoveRows returns, Qt may still
+        # touch the internal pointers of the removed indexes until then
+        if fetched:
+            self.beginRemoveRows(QModelIndex(), first, fetched_last)
+            self.fetched_rows -= fetched_last - first + 1
+        removed_nodes = self.track_nodes[first : last + 1]
+        del self.track_nodes[first : last + 1]
+        for node in removed_nodes:
+            for artist in node.track.artist_details:
+                self.resolved_artists.pop(id(artist), None)
+            del self.track_index[id(node.track)]
+            self.file_paths.discard(os.path.normpath(node.track.file_path))
+            self.dirty_tracks.pop(id(node.track), None)
+            self.unsent_tracks.pop(id(node.track), None)
+        for row in range(first, len(self.track_nodes)):
+            self.track_nodes[row].row = row
+        if fetched:
+            self.endRemoveRows()
+
+    def refresh_track_node(self, node: TrackNode):
+        """Replaces the artist rows of a track if its artist details were changed"""
+        if not node.children_fetched or not self.is_row_fetched(node):
+            # views do not know the artist rows yet, they are read once fetched
+            if not node.children_match():
+                node.children = node.create_children()
+            return
+
+        if node.children_match():
+            if node.children:
+                parent = self.createIndex(node.row, 0, node.track)
+                self.dataChanged.emit(
+                    self.index(0, 0, parent),
+                    self.index(
+                        len(node.children) - 1, self.columnCount(parent) - 1, parent
+                    ),
+                )
+            return
+
+        parent = self.createIndex(node.row, 0, node.track)
+        removed_children = node.children
+        if removed_children:
+            self.beginRemoveRows(parent, 0, len(removed_children) - 1)
+            node.children = []
+            self.endRemoveRows()
+
+        children = node.create_children()
+        if children:
+            self.beginInsertRows(parent, 0, len(children) - 1)
+            node.children = children
+            self.endInsertRows()
 
     def remove_track(self, track):
         """Removes a track from the trackmodel image and the track manager"""
-        # I never made removing individual rows work without crashing the application
-        # so this is the next best thing
-        self.beginResetModel()
-        self.track_manager.remove_track(track)
-        self.create_unique_artist_index()
-        self.endResetModel()
+        self.remove_tracks([track])
+
+    def remove_tracks(self, tracks: list):
+        """Removes several tracks from the trackmodel image and the track manager at once"""
+        tracks = list({id(track): track for track in tracks}.values())
+        # removing the tracks one by one searches the list for each of them
+        removed = {id(track) for track in tracks}
+        self.track_manager.tracks[:] = [
+            track for track in self.track_manager.tracks if id(track) not in removed
+        ]
+
+        self.remove_track_nodes(
+            [node for node in map(self.get_track_node, tracks) if node is not None]
+        )
 
+    def filter_new_files(self, files: list[str]) -> list[str]:
+        """Removes files that are already loaded or listed more than once"""
+        seen = set(self.file_paths)
+        new_files = []
+        for file in files:
+            path = os.path.normpath(file)
+            if path not in seen:
+                seen.add(path)
+                new_files.append(path)
+        return new_files
+
+    @profiled("load_files")
     async def load_files(
         self,
-        files: list[str],
+        files: list[str] | AsyncIterable[list[str]],
         replace_original_title: bool,
         overwrite_original_title: bool,
         replace_original_artist: bool,
         overwrite_original_artist: bool,
         read_artist_json: bool,
     ):
-        """Loads files and reads their metadata"""
-        # a proper implementation would use beginInsertRows in the track model,
-        # but that crashes randomly and I can't figure out why,
-        # so just resetting the view is easier and has only very minor side effects
+        """Loads files and reads their metadata, files can also be streamed in batches"""
+        # files are read in chunks and each chunk is added to the model as soon as
+        # it was read, server data of each chunk is resolved in the background
+        # while the following chunks are read.
+        # The index is synced at the end even if any of the steps fail,
+        # so the model never gets out of step with the track manager
+        resolutions = []
+        # states of the tracks before they were resolved and transformed,
+        # only tracks that changed since are written with the next save
+        states = {}
+        try:
+            try:
+                if isinstance(files, AsyncIterable):
+                    async for batch in files:
+                        await self.read_files(
+                            batch, read_artist_json, states, resolutions
+                        )
+                else:
+                    await self.read_files(files, read_artist_json, states, resolutions)
+            finally:
+                # chunks that were read are resolved even if reading a later one failed
+                self.progress_changed.emit("Resolving artists", 0, 0)
+                results = await asyncio.gather(*resolutions, return_exceptions=True)
+
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                raise Exception(
+                    f"An error occurred querying the server for information: {str(errors[0])}"
+                )
+
+            # artists the server does not know yet are created with the next save
+            self.mark_unsent(
+                track
+                for track, _ in states.values()
+                if not all(artist.has_server_data for artist in track.artist_details)
+            )
 
-        self.beginResetModel()
+            # the transforms run on all tracks, tracks that were already
+            # saved become dirty again if they changed anything on them
+            if replace_original_title or replace_original_artist:
+                for node in self.track_nodes:
+                    if id(node.track) not in self.dirty_tracks:
+                        states.setdefault(
+                            id(node.track),
+                            (node.track, self.get_track_state(node.track)),
+                        )
+
+            if replace_original_title:
+                self.track_manager.replace_original_title(
+                    overwrite=overwrite_original_title
+                )
+
+            if replace_original_artist:
+                self.track_manager.replace_original_artist(
+                    overwrite=overwrite_original_artist
+                )
+        finally:
+            self.mark_changed_tracks_dirty(states)
+            self.create_unique_artist_index()
+
+    async def read_files(
+        self, files: list[str], read_artist_json: bool, states: dict, resolutions: list
+    ):
+        """
+        Reads files in chunks, appending the rows of each chunk once it was read.
+        The state of every new track is recorded in states before the artists of its chunk
+        are resolved by a task that is added to resolutions.
+        """
+        files = self.filter_new_files(files)
+        if not files:
+            return
 
-        try:
-            await self.track_manager.load_files(files, read_artist_json)
-        except Exception as e:
-            raise Exception(f"An error occurred when reading files: {str(e)}")
+        chunks = [
+            files[start : start + self.load_chunk_size]
+            for start in range(0, len(files), self.load_chunk_size)
+        ]
 
-        try:
-            await self.track_manager.update_artists_info_from_db()
-        except Exception as e:
-            raise Exception(
-                f"An error occurred querying the server for information: {str(e)}"
+        # while a chunk is parsed, the tags of the next one are already fetched
+        prefetch = self.tag_reader.prefetch(chunks[0]) if self.tag_reader else None
+
+        for index, chunk in enumerate(chunks):
+            self.progress_changed.emit(
+                "Reading files", index * self.load_chunk_size, len(files)
+            )
+
+            with self.span("read_files", "io", files=len(chunk)):
+                try:
+                    if self.tag_reader:
+                        await prefetch
+                        if index + 1 < len(chunks):
+                            prefetch = self.tag_reader.prefetch(chunks[index + 1])
+                        # tracks are parsed on a worker thread and merged on the loop
+                        new_tracks = await self.tag_reader.read_tracks(
+                            self.track_manager, chunk, read_artist_json
+                        )
+                        self.track_manager.tracks.extend(new_tracks)
+                    else:
+                        # tracks can be removed while loading, new ones are found by identity.
+                        # known tracks are kept alive so that their ids are not reused
+                        known_tracks = {
+                            id(track): track for track in self.track_manager.tracks
+                        }
+                        await self.track_manager.load_files(chunk, read_artist_json)
+                        new_tracks = [
+                            track
+                            for track in self.track_manager.tracks
+                            if id(track) not in known_tracks
+                        ]
+                except Exception as e:
+                    raise Exception(f"An error occurred when reading files: {str(e)}")
+
+            self.insert_tracks(new_tracks)
+            states.update(
+                (id(track), (track, self.get_track_state(track)))
+                for track in new_tracks
+            )
+            resolutions.append(
+                asyncio.ensure_future(self.resolve_read_tracks(new_tracks))
+            )
+            if self.metrics is not None:
+                self.metrics.files_read(len(new_tracks))
+
+            # give the view a chance to paint the new rows
+            await asyncio.sleep(0)
+
+        self.progress_changed.emit("Reading files", len(files), len(files))
+
+    async def fetch_artists_info(self, tracks: list):
+        """
+        Queries the server for the artists of the given tracks, retrying on temporary errors.
+        Tracks are split into batches that are sent concurrently through the request limiter.
+        """
+        batches = [
+            tracks[start : start + self.resolve_batch_size]
+            for start in range(0, len(tracks), self.resolve_batch_size)
+        ]
+        await asyncio.gather(*(self.fetch_artists_batch(batch) for batch in batches))
+
+    async def fetch_artists_batch(self, tracks: list):
+        track_manager = self.create_partial_track_manager(tracks)
+        with (
+            self.time_request("resolve"),
+            self.span("update_artists_info_from_db", "api", tracks=len(tracks)),
+        ):
+            if self.request_limiter is None:
+                await track_manager.update_artists_info_from_db()
+                return
+
+            await self.request_limiter.run(
+                track_manager.update_artists_info_from_db, retry=True
             )
 
-        if replace_original_title:
-            self.track_manager.replace_original_title(
-                overwrite=overwrite_original_title
+    def get_tracks_with_artists(self, tracks: list, artists: list) -> list:
+        """Returns the tracks that contain at least one of the given artists"""
+        artist_ids = {id(artist) for artist in artists}
+        return [
+            track
+            for track in tracks
+            if any(id(artist) in artist_ids for artist in track.artist_details)
+        ]
+
+    async def resolve_read_tracks(self, tracks: list):
+        """Resolves the artists of a chunk that was read and updates its rows once they are resolved"""
+        try:
+            await self.resolve_tracks(tracks)
+        finally:
+            self.refresh_tracks(tracks)
+
+    async def resolve_tracks(self, tracks: list):
+        """
+        Resolves the artists of the given tracks that were not resolved yet, each artist only once.
+        Artists found in the resolution cache are updated locally, the server is only
+        queried for the tracks that contain artists missing from the cache.
+        """
+        pending = {}
+        for track in tracks:
+            for artist in track.artist_details:
+                if id(artist) not in self.resolved_artists:
+                    pending.setdefault(id(artist), artist)
+        if not pending:
+            return
+
+        if self.resolution_cache is None:
+            await self.fetch_artists_info(
+                self.get_tracks_with_artists(tracks, pending.values())
             )
+        else:
+            missing = self.resolution_cache.apply(pending.values())
+            if missing:
+                await self.resolve_uncached_artists(tracks, missing)
+
+        self.resolved_artists.update(pending)
 
-        if replace_original_artist:
-            self.track_manager.replace_original_artist(
-                overwrite=overwrite_original_artist
+        if self.resolution_cache is None:
+            return
+
+        self.stale_artists.extend(
+            artist
+            for artist in pending.values()
+            if self.resolution_cache.needs_revalidation(artist)
+        )
+        if self.stale_artists and (
+            self.revalidation is None or self.revalidation.done()
+        ):
+            self.revalidation = asyncio.ensure_future(self.revalidate_artists())
+
+    async def resolve_uncached_artists(self, tracks: list, artists: list):
+        """
+        Queries the server for artists that are missing from the resolution cache.
+        Artists that share a cache key are only queried once, the others are served
+        from the cache entry the first one created.
+        """
+        queried = {}
+        duplicates = []
+        for artist in artists:
+            key = self.resolution_cache.get_key(artist) or id(artist)
+            if queried.setdefault(key, artist) is not artist:
+                duplicates.append(artist)
+
+        snapshots = self.resolution_cache.snapshot(list(queried.values()))
+        await self.fetch_artists_info(
+            self.get_tracks_with_artists(tracks, queried.values())
+        )
+        self.resolution_cache.store(snapshots)
+
+        # artists whose data could not be cached are queried on their own tracks
+        duplicates = self.resolution_cache.apply(duplicates)
+        if duplicates:
+            snapshots = self.resolution_cache.snapshot(duplicates)
+            await self.fetch_artists_info(
+                self.get_tracks_with_artists(tracks, duplicates)
             )
+            self.resolution_cache.store(snapshots)
+
+    async def revalidate_artists(self):
+        """Refreshes artists that were served from a persistent cache with data from the server"""
+        while self.stale_artists:
+            artists, self.stale_artists = self.stale_artists, []
+            snapshots = self.resolution_cache.snapshot(artists)
+            try:
+                await self.fetch_artists_info(
+                    self.get_tracks_with_artists(
+                        [node.track for node in self.track_nodes], artists
+                    )
+                )
+            except Exception:
+                # the cached data stays in place, it is revalidated in the next session
+                return
+
+            self.resolution_cache.store(snapshots)
+            changed_artists = [
+                artist for artist, _, state in snapshots if vars(artist) != state
+            ]
+            self.mark_dirty(
+                self.get_tracks_with_artists(
+                    [node.track for node in self.track_nodes], changed_artists
+                )
+            )
+            self.create_unique_artist_index()
 
-        self.create_unique_artist_index()
-        self.endResetModel()
+    async def save_files(self) -> int:
+        """
+        Saves changes to loaded files and returns the number of saved files.
+        Only artists of changed tracks are sent to the server and only changed files are written,
+        files that could not be written stay dirty and are retried with the next save.
+        """
+        unsent_tracks = self.get_ordered_tracks(self.unsent_tracks)
+        if unsent_tracks:
+            await self.send_changes(unsent_tracks)
+            for track in unsent_tracks:
+                self.unsent_tracks.pop(id(track), None)
+
+        tracks = self.get_ordered_tracks(self.dirty_tracks)
+        if not tracks:
+            return 0
+
+        errors = await self.write_files(tracks)
+        if self.metrics is not None:
+            self.metrics.files_written(len(tracks) - len(errors))
+        failed = {id(track) for track, _ in errors}
+        for track in tracks:
+            if id(track) not in failed:
+                self.dirty_tracks.pop(id(track), None)
+
+        previous_errors = self.save_errors
+        self.save_errors = {id(track): str(error) for track, error in errors}
+        for node in self.track_nodes:
+            if not self.is_row_fetched(node):
+                continue
+            if id(node.track) in previous_errors or id(node.track) in self.save_errors:
+                index = self.createIndex(node.row, 0, node.track)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.ToolTipRole])
+
+        if not errors:
+            return len(tracks)
+
+        track, error = errors[0]
+        raise Exception(
+            f"{len(errors)} of {len(tracks)} files could not be updated, "
+            f"saving again retries only these files. "
+            f"{track.file_path}: {str(error)}"
+        )
 
-    async def save_files(self):
-        """Saves changes to loaded files"""
+    def get_ordered_tracks(self, tracks: dict) -> list:
+        """Returns the tracks of a track identity dictionary in row order"""
+        return [node.track for node in self.track_nodes if id(node.track) in tracks]
+
+    async def send_changes(self, tracks: list):
+        """Sends the artists of the given tracks to the server"""
+        track_manager = self.create_partial_track_manager(tracks)
         try:
-            await self.track_manager.send_changes_to_db()
+            with self.time_request("send"), self.span("send_changes_to_db", "api"):
+                if self.request_limiter is None:
+                    await track_manager.send_changes_to_db()
+                else:
+                    # updates are not retried, a partially applied update
+                    # could otherwise be sent twice
+                    await self.request_limiter.run(track_manager.send_changes_to_db)
         except Exception as e:
             raise Exception(
                 f"An error occurred when sending update data to the server: {str(e)}"
             )
 
-        try:
-            await self.track_manager.save_files()
-        except Exception as e:
-            raise Exception(f"An error occurred when updating the files: {str(e)}")
+        if self.resolution_cache is not None:
+            self.resolution_cache.invalidate(
+                self.resolution_cache.get_key(artist)
+                for track in tracks
+                for artist in track.artist_details
+            )
+
+    @profiled("write_files", "io")
+    async def write_files(self, tracks: list) -> list:
+        """Writes the tags of tracks and returns (track, error) tuples of failed files"""
+        if self.tag_writer is None:
+            try:
+                await self.create_partial_track_manager(tracks).save_files()
+            except Exception as e:
+                raise Exception(f"An error occurred when updating the files: {str(e)}")
+            return []
+
+        self.progress_changed.emit("Saving files", 0, len(tracks))
+        return await self.tag_writer.save_tracks(
+            self.track_manager,
+            tracks,
+            lambda finished: self.progress_changed.emit(
+                "Saving files", finished, len(tracks)
+            ),
+        )
 
     def get_musicbrainz_url(self, item):
         base_url = "https://musicbrainz.org"
@@ -215,13 +814,12 @@ class TrackModel(QAbstractItemModel):
             return f"{base_url}/track/{item.mb_track_id}"
 
         if (
-            isinstance(item, dict)
-            and isinstance(item["artist"], MbArtistDetails)
-            and not isinstance(item["artist"], SimpleArtistDetails)
-            and item["artist"]
-            and item["artist"].mbid
+            isinstance(item, ArtistNode)
+            and isinstance(item.artist, MbArtistDetails)
+            and not isinstance(item.artist, SimpleArtistDetails)
+            and item.artist.mbid
         ):
-            mbid = item["artist"].mbid
+            mbid = item.artist.mbid
             return f"{base_url}/artist/{mbid}"
 
         return None
@@ -246,37 +844,150 @@ class TrackModel(QAbstractItemModel):
         replace_original_artist: bool,
         overwrite_original_artist: bool,
     ):
-        """Re-imports track, ensuring that all artist_detail objects are simple artists"""
-
-        # only run if the track either has no artist details or artist details are simple artists
-        if not track.artist_details or (
-            track.artist_details
-            and isinstance(track.artist_details[0], SimpleArtistDetails)
-        ):
-            return
-
-        file_path = track.file_path
-
-        self.remove_track(track)
-        await self.load_files(
-            [file_path],
+        """Converts the artist details of a track to simple artists"""
+        await self.convert_tracks_to_simple_artist(
+            [track],
             replace_original_title,
             overwrite_original_title,
             replace_original_artist,
             overwrite_original_artist,
-            False,
         )
 
+    async def convert_tracks_to_simple_artist(
+        self,
+        tracks: list,
+        replace_original_title: bool,
+        overwrite_original_title: bool,
+        replace_original_artist: bool,
+        overwrite_original_artist: bool,
+    ):
+        """
+        Replaces the artist details of tracks with simple artists, the tracks keep their rows.
+        Only the new artists of the converted tracks are resolved and only their rows are updated.
+        """
+
+        # only convert tracks that have artist details which are not simple artists yet
+        tracks = [
+            track
+            for track in tracks
+            if track.artist_details
+            and not isinstance(track.artist_details[0], SimpleArtistDetails)
+        ]
+        if not tracks:
+            return
+
+        track_manager = self.create_partial_track_manager(tracks)
+        try:
+            with self.span("convert_tracks", files=len(tracks)):
+                await self.read_simple_artists(tracks)
+
+            # the new artists were never sent to the server or written to the files
+            self.mark_dirty(tracks)
+
+            try:
+                await self.resolve_tracks(tracks)
+            except Exception as e:
+                raise Exception(
+                    f"An error occurred querying the server for information: {str(e)}"
+                )
+
+            if replace_original_title:
+                track_manager.replace_original_title(overwrite=overwrite_original_title)
+
+            if replace_original_artist:
+                track_manager.replace_original_artist(
+                    overwrite=overwrite_original_artist
+                )
+        finally:
+            self.refresh_tracks(tracks)
+
+    async def read_simple_artists(self, tracks: list):
+        """
+        Builds simple artists for tracks by parsing their files into a scratch track manager,
+        without reading artist json, and moves the artist details over to the loaded tracks.
+        """
+        file_paths = [track.file_path for track in tracks]
+        # the simple artists must not be merged with the artists of the loaded tracks
+        scratch_manager = self.create_partial_track_manager([])
+        try:
+            if self.tag_reader:
+                loaded_tracks = await self.tag_reader.read_tracks(
+                    scratch_manager, file_paths, False
+                )
+            else:
+                await scratch_manager.load_files(file_paths, False)
+                loaded_tracks = scratch_manager.tracks
+        except Exception as e:
+            raise Exception(f"An error occurred when reading files: {str(e)}")
+
+        simple_tracks = {
+            os.path.normpath(track.file_path): track for track in loaded_tracks
+        }
+        for track in tracks:
+            simple_track = simple_tracks.get(os.path.normpath(track.file_path))
+            if simple_track is not None:
+                for artist in track.artist_details:
+                    self.resolved_artists.pop(id(artist), None)
+                track.artist_details = simple_track.artist_details
+
+    def refresh_tracks(self, tracks: list):
+        """Updates the track rows and artist rows of the given tracks"""
+        for track in tracks:
+            node = self.get_track_node(track)
+            if node is None:
+                continue
+
+            self.refresh_track_node(node)
+            if self.is_row_fetched(node):
+                self.dataChanged.emit(
+                    self.createIndex(node.row, 0, track),
+                    self.createIndex(node.row, self.columnCount() - 1, track),
+                )
+
     def rowCount(self, parent=QModelIndex()):
         """Returns the number of rows"""
         if not parent.isValid():
-            return len(self.track_manager.tracks)
+            return self.fetched_rows
         else:
-            track = parent.internalPointer()
-            if isinstance(track, TrackDetails):
-                return len(track.artist_details)
+            # artist nodes are not part of the track index and have no rows
+            node = self.track_index.get(id(parent.internalPointer()))
+            if node and node.children_fetched:
+                return len(node.children)
         return 0
 
+    def hasChildren(self, parent=QModelIndex()):
+        """Reports artist rows before they are fetched, so views show tracks as expandable"""
+        if not parent.isValid():
+            return bool(self.track_nodes)
+
+        node = self.track_index.get(id(parent.internalPointer()))
+        return bool(node and node.children)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """Checks if there are track or artist rows that were not exposed to views yet"""
+        if not parent.isValid():
+            return self.fetched_rows < len(self.track_nodes)
+
+        node = self.track_index.get(id(parent.internalPointer()))
+        return bool(node and node.children and not node.children_fetched)
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Exposes the next batch of track rows or all artist rows of a track"""
+        if not parent.isValid():
+            self.expose_rows(self.fetch_batch_size)
+            return
+
+        node = self.track_index.get(id(parent.internalPointer()))
+        if not node or node.children_fetched:
+            return
+
+        if node.children:
+            self.beginInsertRows(parent, 0, len(node.children) - 1)
+            node.children_fetched = True
+            self.endInsertRows()
+        else:
+            node.children_fetched = True
+
     def columnCount(self, parent=QModelIndex()):
         """Returns the number of columns"""
         if not parent.isValid():
@@ -305,7 +1016,7 @@ class TrackModel(QAbstractItemModel):
         if not index.isValid():
             return None
 
-        if not index.parent().isValid():
+        if not isinstance(index.internalPointer(), ArtistNode):
             # items without parents are track objects
             return self.data_track(index, role)
 
@@ -313,14 +1024,20 @@ class TrackModel(QAbstractItemModel):
         return self.data_artist(index, role)
 
     def data_track(self, index, role=Qt.ItemDataRole.DisplayRole):
-        track = self.track_manager.tracks[index.row()]
-        column = index.column()
-        column_mapping = self.track_column_mappings[column]
+        track = index.internalPointer()
+
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.save_errors.get(id(track))
+
+        column = self.track_columns[index.column()]
 
-        if role not in column_mapping.get("roles", []):
+        if role not in column.roles:
             return None
 
-        value = getattr(track, column_mapping["property"], None)
+        try:
+            value = column.get_value(track)
+        except AttributeError:
+            value = None
 
         if role == Qt.ItemDataRole.CheckStateRole:
             value = Qt.CheckState.Checked if value else Qt.CheckState.Unchecked
@@ -328,17 +1045,16 @@ class TrackModel(QAbstractItemModel):
         return value
 
     def data_artist(self, index, role=Qt.ItemDataRole.DisplayRole):
-        track = index.parent().internalPointer()
-        artist = track.artist_details[index.row()]
-        column_mapping = self.artist_column_mappings[index.column()]
+        artist = index.internalPointer().artist
+        column = self.artist_columns[index.column()]
 
-        if role not in column_mapping.get("roles", []):
+        if role not in column.roles:
             return None
 
-        if column_mapping["property"] == "type" and role == Qt.ItemDataRole.EditRole:
-            return artist.type
-
-        value = getattr(artist, column_mapping["property"], None)
+        try:
+            value = column.get_value(artist)
+        except AttributeError:
+            value = None
 
         if role == Qt.ItemDataRole.CheckStateRole:
             value = Qt.CheckState.Checked if value else Qt.CheckState.Unchecked
@@ -352,25 +1068,31 @@ class TrackModel(QAbstractItemModel):
 
         was_edited = False
 
-        if not index.parent().isValid():
+        item = index.internalPointer()
+
+        if not isinstance(item, ArtistNode):
             # items without parents are track objects
             was_edited = self.setData_track(index, value, role)
         else:
             was_edited = self.setData_artist(index, value, role)
 
         if was_edited:
+            if not isinstance(item, ArtistNode):
+                self.mark_dirty([item])
+            else:
+                self.mark_dirty(self.get_tracks_of_artist(item.artist))
             self.dataChanged.emit(index, index, [role])
             return True
         return False
 
     def setData_track(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
-        track = self.track_manager.tracks[index.row()]
-        column_mapping = self.track_column_mappings[index.column()]
+        track = index.internalPointer()
+        column = self.track_columns[index.column()]
 
-        if role not in column_mapping.get("roles", []):
+        if role not in column.roles:
             return False
 
-        setattr(track, column_mapping["property"], value)
+        setattr(track, column.property, value)
 
         if role == Qt.ItemDataRole.CheckStateRole:
             self.layoutChanged.emit()
@@ -378,23 +1100,22 @@ class TrackModel(QAbstractItemModel):
         return True
 
     def setData_artist(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
-        track = index.parent().internalPointer()
-        artist = track.artist_details[index.row()]
-        column_mapping = self.artist_column_mappings[index.column()]
+        artist = index.internalPointer().artist
+        column = self.artist_columns[index.column()]
 
-        if role not in column_mapping.get("roles", []):
+        if role not in column.roles:
             return False
 
         if role == Qt.ItemDataRole.CheckStateRole:
             value = value == Qt.CheckState.Checked.value
 
-        if column_mapping["property"] == "type":
+        if column.property == "type":
             if value in ["Person", "Character", "Group"]:
-                setattr(artist, column_mapping["property"], value)
+                setattr(artist, column.property, value)
                 self.layoutChanged.emit()
                 return True
 
-        setattr(artist, column_mapping["property"], value)
+        setattr(artist, column.property, value)
 
         if role == Qt.ItemDataRole.CheckStateRole:
             self.layoutChanged.emit()
@@ -404,15 +1125,13 @@ class TrackModel(QAbstractItemModel):
     def index(self, row, column, parent=QModelIndex()):
         """Returns the index of the element at the given position and column"""
         if not parent.isValid():
-            if row < len(self.track_manager.tracks):
-                return self.createIndex(row, column, self.track_manager.tracks[row])
+            if row < self.fetched_rows:
+                return self.createIndex(row, column, self.track_nodes[row].track)
             return QModelIndex()
         else:
-            track = parent.internalPointer()
-            if row < len(track.artist_details):
-                _, track_info = self.get_unique_artist(track, track.artist_details[row])
-                if track_info:
-                    return self.createIndex(row, column, track_info)
+            node = self.get_track_node(parent.internalPointer())
+            if node and node.children_fetched and row < len(node.children):
+                return self.createIndex(row, column, node.children[row])
         return QModelIndex()
 
     def parent(self, index):
@@ -422,27 +1141,16 @@ class TrackModel(QAbstractItemModel):
 
         item = index.internalPointer()
 
-        if isinstance(item, dict) and "track" in item:  # It's a track-artist mapping
-            track = item["track"]
-            row = self.track_manager.tracks.index(track)
-            return self.createIndex(row, 0, track)
+        if isinstance(item, ArtistNode):
+            return self.createIndex(item.parent.row, 0, item.parent.track)
 
         return QModelIndex()
 
     def flags(self, index):
         """Returns the item flags for the specified index, e.g. selectable, editable, checkable"""
-        flags = Qt.ItemFlag.NoItemFlags
-
         if not index.isValid():
-            return flags
-
-        column = index.column()
-        if not index.parent().isValid():
-            column_mapping = self.track_column_mappings[column]
-        else:
-            column_mapping = self.artist_column_mappings[column]
-
-        for flag in column_mapping.get("flags", []):
-            flags |= flag
+            return Qt.ItemFlag.NoItemFlags
 
-        return flags
+        if not isinstance(index.internalPointer(), ArtistNode):
+            return self.track_columns[index.column()].flags
+        return self.artist_columns[index.column()].flags
@@ -0,0 +1,142 @@
+"""
+Generates a synthetic corpus of tagged mp3 files for the benchmarks.
+Every file holds a few silent MPEG frames and an ID3 tag with a title, album and artists.
+Part of the files also carry musicbrainz artist relations, so their artists are loaded as
+musicbrainz artists and can be converted to simple artists.
+
+    uv run python -m benchmarks.corpus --tracks 1000 --output /tmp/corpus
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+from mutagen.id3 import ID3, TALB, TIT2, TPE1, TXXX
+
+# header of an MPEG-1 layer III frame, 128 kbit/s at 44.1 kHz, which is 417 bytes long
+frame_header = bytes([0xFF, 0xFB, 0x90, 0x64])
+frame_size = 417
+silent_frames = 10
+
+# user defined text frame the track manager reads artist relations from
+relations_description = "artist_relations_json"
+relations_share = 0.5
+
+# files of an existing corpus are only reused if it was created by the same version
+corpus_version = "3"
+version_file = ".corpus-version"
+
+
+def get_audio() -> bytes:
+    return (frame_header + bytes(frame_size - len(frame_header))) * silent_frames
+
+
+def get_artists(number: int) -> list[int]:
+    """
+    Returns the artists credited on a track, some tracks credit several artists from a shared pool.
+    The pool grows with the number of the track rather than the size of the corpus,
+    so a track gets the same artists in corpora of any size and its file can be reused.
+    """
+    artists = [random.randrange(max(10, number // 4))]
+    if random.random() < 0.3:
+        artists.append(random.randrange(max(10, number // 4)))
+    return artists
+
+
+def get_relations(artists: list[int]) -> str:
+    """Returns the artist relations of a track in the format of the musicbrainz artist credits"""
+    return json.dumps(
+        [
+            {
+                "name": f"Artist {artist}",
+                "type": "Person",
+                "disambiguation": "",
+                "sort_name": f"Artist {artist}",
+                "id": f"00000000-0000-4000-8000-{artist:012d}",
+                "aliases": [],
+                "type_id": "b6e035f4-3ce9-331c-97df-83397230b0df",
+                "joinphrase": " feat. " if position < len(artists) - 1 else "",
+                "relations": [],
+            }
+            for position, artist in enumerate(artists)
+        ]
+    )
+
+
+def create_corpus(directory: str, tracks: int, seed: int = 0) -> list[str]:
+    """Creates the files of a corpus, files from an earlier run of the same version are reused"""
+    random.seed(seed)
+    os.makedirs(directory, exist_ok=True)
+    audio = get_audio()
+
+    version_path = os.path.join(directory, version_file)
+    try:
+        with open(version_path, encoding="utf-8") as file:
+            reuse = file.read() == corpus_version
+    except OSError:
+        reuse = False
+
+    files = []
+    for number in range(tracks):
+        # files are spread over album directories, as in a real library
+        album = number // 12
+        album_directory = os.path.join(directory, f"album{album:05d}")
+        file_path = os.path.join(album_directory, f"track{number:06d}.mp3")
+        files.append(file_path)
+        artists = get_artists(number)
+        with_relations = random.random() < relations_share
+        if reuse and os.path.exists(file_path):
+            continue
+
+        os.makedirs(album_directory, exist_ok=True)
+        with open(file_path, "wb") as file:
+            file.write(audio)
+
+        tags = ID3()
+        tags.add(TIT2(encoding=3, text=f"Track {number}"))
+        tags.add(TALB(encoding=3, text=f"Album {album}"))
+        tags.add(
+            TPE1(
+                encoding=3,
+                text=" feat. ".join(f"Artist {artist}" for artist in artists),
+            )
+        )
+        if with_relations:
+            tags.add(
+                TXXX(
+                    encoding=3,
+                    desc=relations_description,
+                    text=get_relations(artists),
+                )
+            )
+        tags.save(file_path)
+
+    with open(version_path, "w", encoding="utf-8") as file:
+        file.write(corpus_version)
+    return files
+
+
+def copy_corpus(files: list[str], directory: str, target: str) -> list[str]:
+    """Copies files of a corpus into target, keeping their album directories"""
+    copies = []
+    for file_path in files:
+        copy_path = os.path.join(target, os.path.relpath(file_path, directory))
+        os.makedirs(os.path.dirname(copy_path), exist_ok=True)
+        shutil.copyfile(file_path, copy_path)
+        copies.append(copy_path)
+    return copies
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="Benchmark corpus")
+    parser.add_argument("--tracks", type=int, default=1000)
+    parser.add_argument("--output", type=str, required=True)
+    args = parser.parse_args()
+
+    files = create_corpus(args.output, args.tracks)
+    print(f"{len(files)} files in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
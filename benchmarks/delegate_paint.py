@@ -0,0 +1,130 @@
+"""
+Measures the time ArtistDelegate needs to paint all cells of a synthetic model.
+The first pass fills the style cache, later passes only look styles up.
+
+    QT_QPA_PLATFORM=offscreen uv run python -m benchmarks.delegate_paint --tracks 10000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from PyQt6.QtCore import QModelIndex, QRect
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QApplication, QStyleOptionViewItem
+from artist_resolver.trackmanager import (
+    MbArtistDetails,
+    SimpleArtistDetails,
+    TrackManager,
+)
+from artist_resolver_frontend.delegates import ArtistDelegate
+from artist_resolver_frontend.trackmodel import TrackModel
+
+
+def create_artist(artist_class, number: int):
+    """Creates an artist without going through a track load, only the painted attributes are set"""
+    artist = artist_class.__new__(artist_class)
+    artist.mbid = f"00000000-0000-0000-0000-{number:012d}"
+    artist.name = f"Artist {number}"
+    artist.type = "Person"
+    artist.custom_name = f"Artist {number}"
+    artist.include = random.random() > 0.1
+    artist.custom_name_edited = random.random() > 0.8
+    artist.invalid_relation = random.random() > 0.95
+    artist.has_server_data = random.random() > 0.5
+    return artist
+
+
+def create_model(tracks: int, artists_per_track: int) -> TrackModel:
+    random.seed(0)
+    model = TrackModel(TrackManager("localhost", 0))
+    model.insert_tracks(
+        [
+            SimpleNamespace(
+                file_path=f"/music/track{number}.mp3",
+                title=f"Track {number}",
+                album="Album",
+                formatted_artist="Artist",
+                formatted_new_artist="Artist",
+                artist_details=[
+                    create_artist(
+                        random.choice([MbArtistDetails, SimpleArtistDetails]),
+                        number * artists_per_track + artist,
+                    )
+                    for artist in range(artists_per_track)
+                ],
+            )
+            for number in range(tracks)
+        ]
+    )
+    return model
+
+
+def get_indexes(model: TrackModel) -> list[QModelIndex]:
+    """Fetches all rows of the model, as an expanded and fully scrolled view would, and indexes all cells"""
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+
+    indexes = []
+    columns = model.columnCount()
+    for row in range(model.rowCount()):
+        parent = model.index(row, 0)
+        model.fetchMore(parent)
+        indexes.extend(model.index(row, column) for column in range(columns))
+        for child_row in range(model.rowCount(parent)):
+            indexes.extend(
+                model.index(child_row, column, parent) for column in range(columns)
+            )
+    return indexes
+
+
+def paint_all(delegate, painter, base_option, indexes) -> float:
+    start = time.perf_counter()
+    for index in indexes:
+        # views hand a fresh copy of the option to every cell
+        delegate.paint(painter, QStyleOptionViewItem(base_option), index)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="Delegate paint benchmark")
+    parser.add_argument("--tracks", type=int, default=10000)
+    parser.add_argument("--artists-per-track", type=int, default=2)
+    parser.add_argument("--passes", type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    model = create_model(args.tracks, args.artists_per_track)
+    delegate = ArtistDelegate(model=model)
+    indexes = get_indexes(model)
+
+    image = QImage(400, 30, QImage.Format.Format_ARGB32)
+    painter = QPainter(image)
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, 400, 30)
+    option.font = app.font()
+    option.palette = app.palette()
+
+    cold = paint_all(delegate, painter, option, indexes)
+    warm = [paint_all(delegate, painter, option, indexes) for _ in range(args.passes)]
+    painter.end()
+
+    print(
+        json.dumps(
+            {
+                "cells": len(indexes),
+                "cached_styles": len(delegate.artist_styles),
+                "cold_pass_ms": round(cold * 1000, 1),
+                "warm_pass_ms": round(statistics.median(warm) * 1000, 1),
+                "warm_cell_us": round(statistics.median(warm) / len(indexes) * 1e6, 2),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Compares the legacy 1 ms QTimer pump with the Qt driven QtEventLoop.
+Reports the CPU time used while idle and the latency of local HTTP round trips.
+
+    uv run python -m benchmarks.eventloop --idle-seconds 5 --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from aiohttp import ClientSession, web
+from PyQt6.QtCore import QCoreApplication, QTimer
+from artist_resolver_frontend.eventloop import QtEventLoop
+
+
+def create_pump_loop():
+    """Recreates the previous integration, stopping and restarting the loop each millisecond"""
+    loop = asyncio.new_event_loop()
+
+    def run_async_tasks():
+        loop.call_soon_threadsafe(loop.stop)
+        loop.run_forever()
+
+    timer = QTimer()
+    timer.timeout.connect(run_async_tasks)
+    timer.start(1)
+    loop.pump_timer = timer
+    return loop
+
+
+def run_qt_until(app, loop, coroutine):
+    """Runs the Qt event loop until the coroutine is done"""
+    result = {}
+
+    async def wrapper():
+        try:
+            result["value"] = await coroutine
+        finally:
+            app.quit()
+
+    loop.create_task(wrapper())
+    app.exec()
+    return result["value"]
+
+
+async def measure_idle(seconds: float) -> float:
+    cpu_start = time.process_time()
+    await asyncio.sleep(seconds)
+    return (time.process_time() - cpu_start) / seconds * 100
+
+
+async def measure_latency(requests: int) -> list[float]:
+    async def handle(request):
+        return web.Response(text="ok")
+
+    webapp = web.Application()
+    webapp.add_routes([web.get("/", handle)])
+    runner = web.AppRunner(webapp)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    latencies = []
+    async with ClientSession() as session:
+        for _ in range(requests):
+            start = time.perf_counter()
+            async with session.get(f"http://localhost:{port}/") as response:
+                await response.text()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await runner.cleanup()
+    return latencies
+
+
+def run_benchmark(app, name: str, loop, idle_seconds: float, requests: int) -> dict:
+    asyncio.set_event_loop(loop)
+    idle_cpu = run_qt_until(app, loop, measure_idle(idle_seconds))
+    latencies = run_qt_until(app, loop, measure_latency(requests))
+
+    timer = getattr(loop, "pump_timer", None)
+    if timer:
+        timer.stop()
+    loop.close()
+
+    return {
+        "loop": name,
+        "idle_cpu_percent": round(idle_cpu, 2),
+        "latency_median_ms": round(statistics.median(latencies), 3),
+        "latency_p95_ms": round(statistics.quantiles(latencies, n=20)[-1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="Event loop benchmark")
+    parser.add_argument("--idle-seconds", type=float, default=5)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    loops = {
+        "qtimer-pump": create_pump_loop,
+        "qt-event-loop": QtEventLoop,
+    }
+    results = [
+        run_benchmark(app, name, create_loop(), args.idle_seconds, args.requests)
+        for name, create_loop in loops.items()
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
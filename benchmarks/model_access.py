@@ -0,0 +1,63 @@
+"""
+Measures the per-cell cost of the TrackModel calls a view makes while scrolling,
+data() for the roles a view requests and flags(), on a synthetic model.
+
+    QT_QPA_PLATFORM=offscreen uv run python -m benchmarks.model_access --tracks 10000
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+from benchmarks.delegate_paint import create_model, get_indexes
+
+# roles a QTreeView and its delegate request for every painted cell
+view_roles = [
+    Qt.ItemDataRole.DisplayRole,
+    Qt.ItemDataRole.DecorationRole,
+    Qt.ItemDataRole.FontRole,
+    Qt.ItemDataRole.TextAlignmentRole,
+    Qt.ItemDataRole.ForegroundRole,
+    Qt.ItemDataRole.CheckStateRole,
+    Qt.ItemDataRole.BackgroundRole,
+]
+
+
+def access_all(model, indexes) -> float:
+    start = time.perf_counter()
+    for index in indexes:
+        model.flags(index)
+        for role in view_roles:
+            model.data(index, role)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="Model access benchmark")
+    parser.add_argument("--tracks", type=int, default=10000)
+    parser.add_argument("--artists-per-track", type=int, default=2)
+    parser.add_argument("--passes", type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)  # noqa: F841
+    model = create_model(args.tracks, args.artists_per_track)
+    indexes = get_indexes(model)
+    timings = [access_all(model, indexes) for _ in range(args.passes)]
+
+    print(
+        json.dumps(
+            {
+                "cells": len(indexes),
+                "pass_ms": round(statistics.median(timings) * 1000, 1),
+                "cell_us": round(statistics.median(timings) / len(indexes) * 1e6, 2),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Local stand-in for the artist resolver API used by the benchmarks.
+Every route answers successfully without data, so the client side of resolving
+and saving is exercised without depending on a real server or its latency.
+An artificial latency can be added to model a remote server.
+"""
+
+import asyncio
+from collections import Counter
+from aiohttp import web
+
+
+class StandinApi:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = Counter()
+        self.runner = None
+        self.port = None
+
+    async def handle(self, request):
+        self.requests[f"{request.method} {request.path}"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if request.method == "GET":
+            return web.json_response([])
+        return web.json_response({}, status=200)
+
+    async def start(self) -> int:
+        webapp = web.Application()
+        webapp.add_routes([web.route("*", "/{tail:.*}", self.handle)])
+        self.runner = web.AppRunner(webapp)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "localhost", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        if self.runner is not None:
+            await self.runner.cleanup()
@@ -0,0 +1,93 @@
+"""
+Measures the cold startup of the window in fresh interpreters.
+Reports the time spent importing, the time until the window was painted for the first time
+and the time until the deferred startup (fonts, stylesheet, health check, http server) finished.
+
+    uv run python -m benchmarks.startup --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def run_child() -> None:
+    """Starts the window like main.py does and prints its startup times"""
+    spawned_at = float(os.environ["STARTUP_BENCHMARK_SPAWNED_AT"])
+    offset = time.time() - time.perf_counter()
+
+    start = time.perf_counter()
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+    from artist_resolver_frontend import MainWindow
+
+    imported = time.perf_counter()
+
+    app = QApplication(sys.argv)
+    window = MainWindow(app, "localhost", "1")
+
+    def check():
+        if "ready" not in window.startup_times:
+            QTimer.singleShot(1, check)
+            return
+
+        times = window.startup_times
+
+        def since_spawn(value):
+            return round((value + offset - spawned_at) * 1000, 2)
+
+        print(
+            json.dumps(
+                {
+                    "interpreter_ms": round((start + offset - spawned_at) * 1000, 2),
+                    "import_ms": round((imported - start) * 1000, 2),
+                    "first_paint_ms": since_spawn(times["first_paint"]),
+                    "ready_ms": since_spawn(times["ready"]),
+                }
+            )
+        )
+        window.close()
+
+    QTimer.singleShot(0, check)
+    app.exec()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="Startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    results = []
+    for _ in range(args.runs):
+        env = dict(os.environ, STARTUP_BENCHMARK_SPAWNED_AT=str(time.time()))
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(
+        json.dumps(
+            {
+                key: round(statistics.median(result[key] for result in results), 2)
+                for key in results[0]
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+End to end benchmark of the TrackModel pipeline on a synthetic mp3 corpus against a local stand-in API.
+For every corpus size it times loading, traversing, painting, saving, converting and removing tracks
+and writes all timings to a JSON file, so results of different revisions can be compared.
+
+    QT_QPA_PLATFORM=offscreen uv run python -m benchmarks.suite --sizes 100 1000 10000 50000 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QApplication, QStyleOptionViewItem
+from artist_resolver.trackmanager import SimpleArtistDetails, TrackManager
+from artist_resolver_frontend.delegates import ArtistDelegate
+from artist_resolver_frontend.requestlimiter import RequestLimiter
+from artist_resolver_frontend.resolutioncache import ResolutionCache
+from artist_resolver_frontend.tagreader import TagReader
+from artist_resolver_frontend.tagwriter import TagWriter
+from artist_resolver_frontend.trackmodel import TrackModel
+from benchmarks.corpus import copy_corpus, create_corpus
+from benchmarks.delegate_paint import get_indexes, paint_all
+from benchmarks.model_access import access_all
+from benchmarks.standin_api import StandinApi
+
+
+def create_model(api_port: int) -> TrackModel:
+    return TrackModel(
+        TrackManager("localhost", str(api_port)),
+        TagReader(),
+        ResolutionCache(),
+        RequestLimiter(),
+        TagWriter(),
+    )
+
+
+def paint_cells(app, delegate, indexes) -> float:
+    image = QImage(400, 30, QImage.Format.Format_ARGB32)
+    painter = QPainter(image)
+    option = QStyleOptionViewItem()
+    option.rect = QRect(0, 0, 400, 30)
+    option.font = app.font()
+    option.palette = app.palette()
+    try:
+        return paint_all(delegate, painter, option, indexes)
+    finally:
+        painter.end()
+
+
+async def benchmark_size(app, files: list[str], api_port: int, operations: int) -> dict:
+    model = create_model(api_port)
+    result = {"tracks": len(files)}
+
+    start = time.perf_counter()
+    await model.load_files(files, True, False, True, False, True)
+    result["load_files_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexes = get_indexes(model)
+    result["fetch_rows_s"] = time.perf_counter() - start
+    result["cells"] = len(indexes)
+    result["traverse_s"] = access_all(model, indexes)
+
+    delegate = ArtistDelegate(model=model)
+    result["paint_cold_s"] = paint_cells(app, delegate, indexes)
+    result["paint_warm_s"] = paint_cells(app, delegate, indexes)
+
+    start = time.perf_counter()
+    result["saved_files"] = await model.save_files()
+    result["save_files_s"] = time.perf_counter() - start
+
+    # tracks that only have simple artists are skipped by the conversion
+    convertible = [
+        node.track
+        for node in model.track_nodes
+        if node.track.artist_details
+        and not isinstance(node.track.artist_details[0], SimpleArtistDetails)
+    ]
+    bulk_convertible = convertible[operations : operations * 2]
+    timings = []
+    for track in convertible[:operations]:
+        start = time.perf_counter()
+        await model.convert_track_to_simple_artist(track, True, False, True, False)
+        timings.append(time.perf_counter() - start)
+    if not convertible:
+        print(
+            "No musicbrainz artists were loaded, conversions were not measured",
+            file=sys.stderr,
+        )
+    result["converted_tracks"] = len(timings)
+    result["convert_track_mean_s"] = statistics.mean(timings) if timings else None
+
+    start = time.perf_counter()
+    await model.convert_tracks_to_simple_artist(
+        bulk_convertible, True, False, True, False
+    )
+    result["bulk_converted_tracks"] = len(bulk_convertible)
+    result["convert_tracks_bulk_s"] = time.perf_counter() - start
+
+    timings = []
+    for node in model.track_nodes[-operations:]:
+        start = time.perf_counter()
+        model.remove_track(node.track)
+        timings.append(time.perf_counter() - start)
+    result["remove_track_mean_s"] = statistics.mean(timings) if timings else None
+
+    # every other row, so each track is removed as its own range
+    tracks = [node.track for node in model.track_nodes[: operations * 2 : 2]]
+    start = time.perf_counter()
+    model.remove_tracks(tracks)
+    result["removed_tracks_bulk"] = len(tracks)
+    result["remove_tracks_bulk_s"] = time.perf_counter() - start
+
+    model.tag_reader.shutdown()
+    model.tag_writer.shutdown()
+    return result
+
+
+async def run(app, sizes: list[int], corpus_dir: str, operations: int) -> dict:
+    files = create_corpus(corpus_dir, max(sizes))
+    api = StandinApi()
+    api_port = await api.start()
+
+    results = []
+    try:
+        for size in sorted(sizes):
+            # saving and converting rewrite files, so every size runs on a fresh copy
+            with tempfile.TemporaryDirectory() as work_dir:
+                result = await benchmark_size(
+                    app,
+                    copy_corpus(files[:size], corpus_dir, work_dir),
+                    api_port,
+                    operations,
+                )
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+    finally:
+        await api.stop()
+
+    return {
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+        "api_requests": dict(api.requests),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="Benchmark suite")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000]
+    )
+    parser.add_argument("--output", type=str, default="benchmark-results.json")
+    parser.add_argument(
+        "--corpus-dir",
+        type=str,
+        default=os.path.join(tempfile.gettempdir(), "artist-resolver-corpus"),
+        help="Directory of the synthetic corpus, it is reused by later runs and never modified",
+    )
+    parser.add_argument(
+        "--operations",
+        type=int,
+        default=20,
+        help="Number of tracks that are converted and removed per size",
+    )
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    report = asyncio.run(run(app, args.sizes, args.corpus_dir, args.operations))
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
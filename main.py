@@ -5,6 +5,13 @@ from pathlib import Path
 from xml.sax.saxutils import escape
 
 
+def get_cache_dir() -> Path:
+    cache_dir = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
+    config_dir = cache_dir / "artist-resolver-frontend"
+    config_dir.mkdir(parents=True, exist_ok=True)
+    return config_dir
+
+
 def configure_fontconfig() -> None:
     if "FONTCONFIG_FILE" in os.environ:
         return
@@ -13,35 +20,73 @@ def configure_fontconfig() -> None:
 
     project_root = Path(__file__).resolve().parent
     font_dir = project_root / "font"
-    cache_dir = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache"))
-    config_dir = cache_dir / "artist-resolver-frontend"
-    config_dir.mkdir(parents=True, exist_ok=True)
+    config_dir = get_cache_dir()
 
     fontconfig_file = config_dir / "fonts.conf"
-    fontconfig_file.write_text(
-        "\n".join(
-            [
-                '<?xml version="1.0"?>',
-                '<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">',
-                "<fontconfig>",
-                f"  <dir>{escape(str(font_dir))}</dir>",
-                '  <cachedir prefix="xdg">fontconfig</cachedir>',
-                "</fontconfig>",
-            ]
-        ),
-        encoding="utf-8",
+    fontconfig = "\n".join(
+        [
+            '<?xml version="1.0"?>',
+            '<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">',
+            "<fontconfig>",
+            f"  <dir>{escape(str(font_dir))}</dir>",
+            '  <cachedir prefix="xdg">fontconfig</cachedir>',
+            "</fontconfig>",
+        ]
     )
+
+    # an unchanged file keeps its timestamp, so fontconfig can reuse its cache
+    try:
+        unchanged = fontconfig_file.read_text(encoding="utf-8") == fontconfig
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        fontconfig_file.write_text(fontconfig, encoding="utf-8")
     os.environ["FONTCONFIG_FILE"] = str(fontconfig_file)
 
 
-configure_fontconfig()
-from artist_resolver_frontend import MainWindow  # noqa: E402
+def run_batch(
+    paths: list[str],
+    api_host: str,
+    api_port: str,
+    batch_workers: int,
+    chunk_size: int,
+    args,
+    tag_reader,
+    tag_writer,
+    resolution_cache,
+    request_limiter,
+) -> int:
+    """Processes files without the gui and prints a throughput summary"""
+    import asyncio
+    import json
+    from artist_resolver_frontend import BatchRunner
 
+    runner = BatchRunner(
+        api_host,
+        api_port,
+        batch_workers,
+        chunk_size,
+        not args.no_replace_title,
+        args.overwrite_title,
+        not args.no_replace_artist,
+        args.overwrite_artist,
+        tag_reader,
+        tag_writer,
+        resolution_cache,
+        request_limiter,
+    )
+    try:
+        summary = asyncio.run(runner.run(paths))
+    finally:
+        runner.shutdown()
 
-def main():
+    for file_path, error in runner.failed_files:
+        print(f"{file_path}: {error}", file=sys.stderr)
+    print(json.dumps(summary, indent=2))
+    return 1 if runner.failed_files else 0
 
-    from PyQt6.QtWidgets import QApplication
 
+def main():
     parser = argparse.ArgumentParser(prog="Artist Relation Resolver")
     parser.add_argument(
         "-s",
@@ -57,11 +102,170 @@ def main():
         required=False,
         help="Port of the Artist Relation Resolver API",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        required=False,
+        help="Number of workers used to fetch and write tags, tags are parsed on a single loader thread",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        required=False,
+        help="Maximum number of artists kept in the resolution cache",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        required=False,
+        help="Seconds after which cached artist data is fetched from the server again",
+    )
+    parser.add_argument(
+        "--persistent-cache",
+        action="store_true",
+        help="Keep resolved artists on disk to speed up later sessions",
+    )
+    parser.add_argument(
+        "--api-concurrency",
+        type=int,
+        required=False,
+        help="Maximum number of resolve and update calls running at the same time",
+    )
+    parser.add_argument(
+        "--api-retries",
+        type=int,
+        required=False,
+        help="Number of times a failed resolve call is retried",
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="PATH",
+        required=False,
+        help="Process files and directories without the gui and exit",
+    )
+    parser.add_argument(
+        "--batch-workers",
+        type=int,
+        required=False,
+        help="Number of chunks processed at the same time in batch mode",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        required=False,
+        help="Number of files loaded, resolved and saved together in batch mode",
+    )
+    parser.add_argument(
+        "--no-replace-title",
+        action="store_true",
+        help="Do not replace original titles in batch mode",
+    )
+    parser.add_argument(
+        "--overwrite-title",
+        action="store_true",
+        help="Overwrite existing original titles in batch mode",
+    )
+    parser.add_argument(
+        "--no-replace-artist",
+        action="store_true",
+        help="Do not replace original artists in batch mode",
+    )
+    parser.add_argument(
+        "--overwrite-artist",
+        action="store_true",
+        help="Overwrite existing original artists in batch mode",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record timing spans of hot paths, F12 toggles an overlay showing them",
+    )
+    parser.add_argument(
+        "--profile-trace",
+        type=str,
+        required=False,
+        help="Chrome trace file the recorded spans are written to on exit or with F11",
+    )
 
     args = parser.parse_args()
 
     api_host = args.host if args.host else os.getenv("ARTIST_RESOLVER_HOST", None)
     api_port = args.port if args.port else os.getenv("ARTIST_RESOLVER_PORT", None)
+    workers = (
+        args.workers
+        if args.workers is not None
+        else int(os.getenv("ARTIST_RESOLVER_WORKERS", 0))
+    )
+    cache_size = (
+        args.cache_size
+        if args.cache_size is not None
+        else int(os.getenv("ARTIST_RESOLVER_CACHE_SIZE", 10000))
+    )
+    cache_ttl = (
+        args.cache_ttl
+        if args.cache_ttl is not None
+        else float(os.getenv("ARTIST_RESOLVER_CACHE_TTL", 3600))
+    )
+    api_concurrency = (
+        args.api_concurrency
+        if args.api_concurrency is not None
+        else int(os.getenv("ARTIST_RESOLVER_API_CONCURRENCY", 4))
+    )
+    api_retries = (
+        args.api_retries
+        if args.api_retries is not None
+        else int(os.getenv("ARTIST_RESOLVER_API_RETRIES", 3))
+    )
+    cache_file = (
+        str(get_cache_dir() / "resolution-cache.sqlite")
+        if args.persistent_cache or os.getenv("ARTIST_RESOLVER_PERSISTENT_CACHE")
+        else None
+    )
+
+    if args.batch:
+        from artist_resolver_frontend import (
+            TagReader,
+            TagWriter,
+            ResolutionCache,
+            PersistentResolutionCache,
+            RequestLimiter,
+        )
+
+        resolution_cache = (
+            PersistentResolutionCache(cache_file, cache_size, cache_ttl)
+            if cache_file
+            else ResolutionCache(cache_size, cache_ttl)
+        )
+        try:
+            return run_batch(
+                args.batch,
+                api_host,
+                api_port,
+                args.batch_workers
+                or int(os.getenv("ARTIST_RESOLVER_BATCH_WORKERS", 4)),
+                args.chunk_size or int(os.getenv("ARTIST_RESOLVER_CHUNK_SIZE", 500)),
+                args,
+                TagReader(workers or None),
+                TagWriter(workers or None),
+                resolution_cache,
+                RequestLimiter(api_concurrency, api_retries),
+            )
+        finally:
+            if cache_file:
+                resolution_cache.close()
+
+    profile_trace = args.profile_trace or os.getenv("ARTIST_RESOLVER_PROFILE_TRACE")
+    profile = (
+        args.profile
+        or bool(os.getenv("ARTIST_RESOLVER_PROFILE"))
+        or bool(profile_trace)
+    )
+
+    configure_fontconfig()
+    from PyQt6.QtWidgets import QApplication
+    from artist_resolver_frontend import MainWindow, Profiler
 
     sys._excepthook = sys.excepthook
 
@@ -73,13 +277,21 @@ def main():
     sys.excepthook = exception_hook
 
     app = QApplication(sys.argv)
-    main_window = MainWindow(app, api_host, api_port)
-
-    try:
-        main_window.loop.run_forever()
-    except RuntimeError as e:
-        print(f"Caught RuntimeError when the loop was closed: {e}")
+    main_window = MainWindow(  # noqa: F841
+        app,
+        api_host,
+        api_port,
+        workers or None,
+        cache_size,
+        cache_ttl,
+        cache_file,
+        api_concurrency,
+        api_retries,
+        Profiler() if profile else None,
+        profile_trace,
+    )
+    app.exec()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
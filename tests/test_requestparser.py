@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from artist_resolver_frontend.requestparser import LoadRequestParser
+
+entries = [{"path": "/a.mp3"}, {"path": "/b é.mp3", "nested": [1, {"x": None}]}]
+
+bodies = [
+    {"files": entries},
+    {"z": 1.5, "files": entries, "n": -2e10},
+    {"files": entries, "z": 1.5},
+    {"a": 10, "b": [1, 2.25, -3], "c": True, "d": None, "files": entries, "e": 0},
+    {"files": [], "z": 12345},
+]
+
+
+def parse_chunks(chunks) -> list:
+    parser = LoadRequestParser()
+    parsed = []
+    for chunk in chunks:
+        parsed.extend(parser.feed(chunk))
+    parsed.extend(parser.finish())
+    return parsed
+
+
+def encode(body, separators=(",", ":")) -> bytes:
+    return json.dumps(body, ensure_ascii=False, separators=separators).encode()
+
+
+@pytest.mark.parametrize("separators", [(",", ":"), (", ", ": ")])
+@pytest.mark.parametrize("body", bodies)
+def test_every_split(body, separators):
+    data = encode(body, separators)
+    for split in range(len(data) + 1):
+        assert parse_chunks([data[:split], data[split:]]) == body["files"], split
+
+
+@pytest.mark.parametrize("body", bodies)
+def test_byte_by_byte(body):
+    data = encode(body)
+    assert parse_chunks(data[i : i + 1] for i in range(len(data))) == body["files"]
+
+
+def test_number_split_inside_fraction():
+    assert parse_chunks([b'{"files":[{"path":"/a.mp3"}],"z":1.', b"5}"]) == [
+        {"path": "/a.mp3"}
+    ]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b'{"files":[{"path":"/a.mp3"}',
+        b'{"files":[{"path":"/a.mp3"}],"z":1.',
+        b'{"files":[{"path":"/a.mp3"}],"z":1x}',
+        b'{"files":{"path":"/a.mp3"}}',
+        b'{"files":[{"path":"/a.mp3"}]} x',
+    ],
+)
+def test_invalid_bodies(data):
+    for split in range(len(data) + 1):
+        with pytest.raises(ValueError):
+            parse_chunks([data[:split], data[split:]])